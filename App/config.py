@@ -1,11 +1,18 @@
 import os
 
+from App.database import postgres_url
+
 def load_config(app, overrides):
     if os.path.exists(os.path.join('./App', 'custom_config.py')):
         app.config.from_object('App.custom_config')
     else:
         app.config.from_object('App.default_config')
     app.config.from_prefixed_env()
+    # render.yaml provisions PostgreSQL through POSTGRES_* variables; an
+    # explicit FLASK_SQLALCHEMY_DATABASE_URI still wins
+    postgres = postgres_url(os.environ)
+    if postgres and 'FLASK_SQLALCHEMY_DATABASE_URI' not in os.environ:
+        app.config['SQLALCHEMY_DATABASE_URI'] = postgres
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['TEMPLATES_AUTO_RELOAD'] = True
     app.config['PREFERRED_URL_SCHEME'] = 'https'
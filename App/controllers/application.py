@@ -1,26 +1,70 @@
 # App/controllers/application.py
-from App.database import db
+from App.database import db, retry_on_lock
 from App.models.application import Application
 from App.models.position import Position
 from App.models.student import Student
 from App.models.staff import Staff
 from App.models.employer import Employer
-from App.models.shortlist import Shortlist
+from App.models.shortlist import Shortlist, DecisionStatus
+from App.models.application_event import ApplicationEvent, record_event
 from App.models.application_status import ApplicationStatus
 from App.models.states import InvalidTransitionError
+from App.controllers.position import reserve_position_slot
+from App.controllers.stats import adjust_stats, count_transition
+from App.controllers.notifications import queue_decision_notifications
+from App.models.position_stats import ALL_POSITIONS
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, joinedload
 
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BULK_ITEMS = 5000
+
+
+class DuplicateApplicationError(Exception):
+    pass
+
+
+class PositionFullError(Exception):
+    pass
+
+
+def has_applied(student_id):
+    """Indexed existence check on application.student_id."""
+    query = db.session.query(Application.id).filter_by(student_id=student_id)
+    return db.session.query(query.exists()).scalar()
+
+
+@retry_on_lock
 def apply(student_user_id):
     student = Student.query.filter_by(user_id=student_user_id).first()
     if not student:
         raise PermissionError("Only students can submit applications.")
 
+    if has_applied(student.id):
+        raise DuplicateApplicationError(
+            f"Student with user id {student.user_id} has already sent in an application"
+        )
+
     new_app = Application(student_id=student.id)
     db.session.add(new_app)
-    db.session.commit()
+    # Opens the history: from None, by the student
+    record_event(db.session, new_app, None, ApplicationStatus.APPLIED, student_user_id)
+    try:
+        adjust_stats(count_transition({}, ALL_POSITIONS, None, ApplicationStatus.APPLIED))
+        db.session.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent apply; the unique index has the final say
+        db.session.rollback()
+        raise DuplicateApplicationError(
+            f"Student with user id {student.user_id} has already sent in an application"
+        )
     return new_app
 
 
+@retry_on_lock
 def shortlist(staff_user_id, application_id, position_id):
     """
     Staff shortlists an existing application to a specific position.
@@ -50,7 +94,12 @@ def shortlist(staff_user_id, application_id, position_id):
     if existing:
         # Already shortlisted to this position; ensure state is SHORTLISTED
         if application.status != ApplicationStatus.SHORTLISTED:
-            application.shortlist()
+            previous = application.status
+            application.shortlist(staff_user_id)
+            if not claim_transition([application.id], previous, application.status):
+                db.session.rollback()
+                raise InvalidTransitionError("Application was shortlisted concurrently.")
+            adjust_stats(count_transition({}, ALL_POSITIONS, previous, application.status))
         db.session.commit()
         return existing
     default_title = position.title 
@@ -65,13 +114,148 @@ def shortlist(staff_user_id, application_id, position_id):
     db.session.add(shortlist_entry)
 
     # State machine enforces APPLIED → SHORTLISTED
-    application.shortlist()
+    previous = application.status
+    application.shortlist(staff_user_id)
+    if not claim_transition([application.id], previous, application.status):
+        db.session.rollback()
+        raise InvalidTransitionError("Application was shortlisted concurrently.")
+
+    deltas = count_transition({}, ALL_POSITIONS, previous, application.status)
+    adjust_stats(count_transition(deltas, position.id, None, DecisionStatus.PENDING))
 
     db.session.commit()
     return shortlist_entry
 
 
 
+@retry_on_lock
+def bulk_shortlist(staff_user_id, pairs):
+    """
+    Shortlist many (application_id, position_id) pairs in one transaction.
+
+    Validation is set-based (one query each for applications, positions
+    and existing shortlists), transitions go through the state machine,
+    new Shortlist rows are bulk inserted, and everything commits once.
+    APPLIED → SHORTLISTED is claimed with one conditional UPDATE first, so
+    of two concurrent shortlists only one moves each application; the
+    other refuses it. Returns one result dict per pair, in input order,
+    with status "shortlisted", "already_shortlisted" or "refused".
+    """
+    staff = Staff.query.filter_by(user_id=staff_user_id).first()
+    if not staff:
+        raise PermissionError("Only staff can shortlist applications.")
+
+    application_ids = {a for a, _ in pairs if a is not None}
+    position_ids = {p for _, p in pairs if p is not None}
+
+    applications = {
+        a.id: a for a in Application.query.filter(Application.id.in_(application_ids))
+    } if application_ids else {}
+    positions = {
+        row.id for row in db.session.query(Position.id).filter(Position.id.in_(position_ids))
+    } if position_ids else set()
+    existing = {
+        (row.application_id, row.position_id): row.id
+        for row in db.session.query(
+            Shortlist.id, Shortlist.application_id, Shortlist.position_id
+        ).filter(Shortlist.application_id.in_(application_ids))
+    } if application_ids else {}
+
+    # Applications this request would move out of APPLIED; the ones another
+    # request moved since we read them are not in claimed and get refused
+    candidates = {
+        application_id for application_id, position_id in pairs
+        if application_id in applications and position_id in positions
+        and (application_id, position_id) not in existing
+        and applications[application_id].status == ApplicationStatus.APPLIED
+    }
+    claimed = claim_transitions(candidates, ApplicationStatus.APPLIED, ApplicationStatus.SHORTLISTED)
+
+    results = []
+    new_rows = []
+    repeats = []
+    pending = {}
+    deltas = {}
+    for application_id, position_id in pairs:
+        result = {"application_id": application_id, "position_id": position_id}
+        results.append(result)
+        application = applications.get(application_id)
+
+        if application is None:
+            result.update(status="refused", message="Application not found.")
+        elif position_id not in positions:
+            result.update(status="refused", message="Position not found.")
+        elif (application_id, position_id) in existing:
+            result.update(status="already_shortlisted",
+                          shortlist_id=existing[(application_id, position_id)])
+        elif (application_id, position_id) in pending:
+            # Same pair twice in one request; resolved after the insert
+            result.update(status="already_shortlisted")
+            repeats.append((result, pending[(application_id, position_id)]))
+        elif application_id in candidates and application_id not in claimed:
+            result.update(status="refused", message="Application was shortlisted concurrently.")
+        else:
+            previous = application.status
+            try:
+                # State machine enforces APPLIED → SHORTLISTED
+                application.shortlist(staff_user_id)
+            except InvalidTransitionError as e:
+                result.update(status="refused", message=str(e))
+                continue
+            count_transition(deltas, ALL_POSITIONS, previous, application.status)
+            count_transition(deltas, position_id, None, DecisionStatus.PENDING)
+            result.update(status="shortlisted")
+            pending[(application_id, position_id)] = result
+            new_rows.append((result, {
+                "application_id": application_id,
+                "position_id": position_id,
+                "staff_id": staff.id,
+            }))
+
+    if new_rows:
+        shortlist_ids = db.session.scalars(
+            insert(Shortlist).returning(Shortlist.id, sort_by_parameter_order=True),
+            [row for _, row in new_rows]
+        ).all()
+        for (result, _), shortlist_id in zip(new_rows, shortlist_ids):
+            result["shortlist_id"] = shortlist_id
+        for result, first in repeats:
+            result["shortlist_id"] = first["shortlist_id"]
+
+    adjust_stats(deltas)
+    db.session.commit()
+    return results
+
+
+def claim_transitions(application_ids, from_status, to_status):
+    """
+    Conditional status change:
+    UPDATE application SET status = :to WHERE id IN (...) AND status = :from
+    The state machine validated the transition on an unlocked read; this
+    write is what decides between concurrent writers, since it waits for
+    their row locks and re-checks the status. Returns the set of ids it
+    moved; the others have moved on. Caller commits.
+    """
+    if not application_ids:
+        return set()
+    # Without no_autoflush the pending in-memory transition would be
+    # flushed first and the WHERE would never match
+    with db.session.no_autoflush:
+        return set(db.session.scalars(
+            update(Application)
+            .where(Application.id.in_(application_ids), Application.status == from_status)
+            .values(status=to_status)
+            .returning(Application.id),
+            execution_options={"synchronize_session": False},
+        ))
+
+
+def claim_transition(application_ids, from_status, to_status):
+    """claim_transitions for all-or-nothing callers: False when any has moved on."""
+    return len(claim_transitions(application_ids, from_status, to_status)) == len(application_ids)
+
+
+@retry_on_lock
 def decide(employer_user_id, application_id, decision):
     """
     Employer makes the final decision on an application.
@@ -98,26 +282,135 @@ def decide(employer_user_id, application_id, decision):
     #     raise PermissionError("You can only decide applications for your own positions.")
 
     normalized = decision.strip().upper()
+    previous_status, previous_decision = application.status, shortlist.status
 
+    # Everything below runs in one transaction, committed once at the end
     if normalized == ApplicationStatus.ACCEPTED.value:
-        application.accept()
+        application.accept(employer_user_id)
         shortlist.update_status(normalized)
 
-        # Decrement available positions if your model supports this
-        if hasattr(position, "update_number_of_positions"):
-            position.update_number_of_positions(position.number_of_positions - 1)
-
     elif normalized == ApplicationStatus.REJECTED.value:
-        application.reject()
+        application.reject(employer_user_id)
         shortlist.update_status(normalized)
 
     else:
         raise ValueError("Decision must be either 'ACCEPTED' or 'REJECTED'.")
 
+    if not claim_transition([application.id], previous_status, application.status):
+        db.session.rollback()
+        raise InvalidTransitionError("Application was decided concurrently.")
+
+    # Conditional decrement: only one of several concurrent accepts can
+    # take the last opening, and a full position refuses the accept.
+    if normalized == ApplicationStatus.ACCEPTED.value and not reserve_position_slot(position.id):
+        db.session.rollback()
+        raise PositionFullError("Position has no openings left.")
+
+    deltas = count_transition({}, ALL_POSITIONS, previous_status, application.status)
+    adjust_stats(count_transition(deltas, position.id, previous_decision, shortlist.status))
+    # Delivered later by the notifier; committed with the decision or not at all
+    queue_decision_notifications([(application.id, normalized)], position.id)
+
     db.session.commit()
     return application
 
 
+@retry_on_lock
+def bulk_decide(employer_user_id, position_id, decisions):
+    """
+    Apply many ACCEPTED/REJECTED decisions for one position atomically.
+
+    decisions is a list of (application_id, decision) pairs. Ownership is
+    checked once, shortlists are loaded with one query, transitions go
+    through the state machine, and accepts beyond the remaining openings
+    are refused. Capacity is taken with one counted conditional UPDATE and
+    everything commits together.
+    Returns {"accepted": [...], "rejected": [...], "refused": [...]}.
+    """
+    employer = Employer.query.filter_by(user_id=employer_user_id).first()
+    if not employer:
+        raise PermissionError("Only employers can decide applications.")
+
+    position = db.session.get(Position, position_id)
+    if not position:
+        raise ValueError("Position not found.")
+    if position.employer_id != employer.id:
+        raise PermissionError("You can only decide applications for your own positions.")
+
+    application_ids = {a for a, _ in decisions if a is not None}
+    shortlists = {
+        s.application_id: s
+        for s in Shortlist.query.options(joinedload(Shortlist.application)).filter(
+            Shortlist.position_id == position.id,
+            Shortlist.application_id.in_(application_ids)
+        )
+    } if application_ids else {}
+
+    openings = position.number_of_positions or 0
+    outcome = {"accepted": [], "rejected": [], "refused": []}
+    seen = set()
+    deltas = {}
+    transitions = {}
+
+    def refuse(application_id, message):
+        outcome["refused"].append({"application_id": application_id, "message": message})
+
+    for application_id, decision in decisions:
+        normalized = decision.strip().upper() if isinstance(decision, str) else None
+        shortlist_entry = shortlists.get(application_id)
+
+        if application_id is None:
+            refuse(application_id, "Invalid application id.")
+            continue
+        if application_id in seen:
+            refuse(application_id, "Duplicate decision for this application.")
+            continue
+        seen.add(application_id)
+
+        if normalized not in (ApplicationStatus.ACCEPTED.value, ApplicationStatus.REJECTED.value):
+            refuse(application_id, "Decision must be either 'ACCEPTED' or 'REJECTED'.")
+        elif shortlist_entry is None:
+            refuse(application_id, "Application is not shortlisted to this position.")
+        elif normalized == ApplicationStatus.ACCEPTED.value and len(outcome["accepted"]) >= openings:
+            refuse(application_id, "Position has no openings left.")
+        else:
+            application = shortlist_entry.application
+            previous_status, previous_decision = application.status, shortlist_entry.status
+            try:
+                if normalized == ApplicationStatus.ACCEPTED.value:
+                    application.accept(employer_user_id)
+                else:
+                    application.reject(employer_user_id)
+            except InvalidTransitionError as e:
+                refuse(application_id, str(e))
+                continue
+            shortlist_entry.update_status(normalized)
+            transitions.setdefault((previous_status, application.status), []).append(application_id)
+            count_transition(deltas, ALL_POSITIONS, previous_status, application.status)
+            count_transition(deltas, position.id, previous_decision, shortlist_entry.status)
+            outcome[normalized.lower()].append(application_id)
+
+    for (from_status, to_status), ids in transitions.items():
+        if not claim_transition(ids, from_status, to_status):
+            # Another request decided one of them since we read it; nothing applied
+            db.session.rollback()
+            raise InvalidTransitionError("An application was decided concurrently; nothing was applied.")
+
+    if outcome["accepted"] and not reserve_position_slot(position.id, len(outcome["accepted"])):
+        # Openings were taken concurrently since we read them; nothing applied
+        db.session.rollback()
+        raise PositionFullError("Position has no openings left.")
+
+    adjust_stats(deltas)
+    queue_decision_notifications(
+        [(a, ApplicationStatus.ACCEPTED.value) for a in outcome["accepted"]]
+        + [(a, ApplicationStatus.REJECTED.value) for a in outcome["rejected"]],
+        position.id
+    )
+    db.session.commit()
+    return outcome
+
+
 def get_status(application_id):
     application = Application.query.get(application_id)
     if not application:
@@ -125,6 +418,30 @@ def get_status(application_id):
     return application.status.value
 
 
+def get_application_history(application_id):
+    """
+    State transitions of one application, oldest first, read from the
+    (application_id, created_at) index.
+    """
+    rows = (
+        db.session.query(
+            ApplicationEvent.from_status, ApplicationEvent.to_status,
+            ApplicationEvent.actor_user_id, ApplicationEvent.created_at
+        )
+        .filter(ApplicationEvent.application_id == application_id)
+        .order_by(ApplicationEvent.created_at, ApplicationEvent.id)
+    )
+    return [
+        {
+            "from": row.from_status.name if row.from_status else None,
+            "to": row.to_status.name,
+            "actor_user_id": row.actor_user_id,
+            "created_at": row.created_at.isoformat(),
+        }
+        for row in rows
+    ]
+
+
 def get_application_json(application_id):
     application = Application.query.get(application_id)
     if not application:
@@ -139,3 +456,61 @@ def get_applications_by_student_json(student_user_id):
     apps = Application.query.filter_by(student_id=student.id).all()
     return [app.toJSON() for app in apps]
 
+
+
+def with_shortlist_positions(query):
+    """
+    Batch-load each application's shortlists and their positions so that
+    serializing a page costs one extra SELECT instead of two per row.
+    """
+    return query.options(
+        selectinload(Application.shortlists).joinedload(Shortlist.position)
+    )
+
+
+def filter_applications(query, after=None, status=None, student_id=None, position_id=None):
+    """
+    Apply the keyset cursor and optional filters to a query over
+    applications (ORM entities or projected columns), ordered by id.
+    """
+    if status is not None:
+        query = query.filter(Application.status == status)
+    if student_id is not None:
+        query = query.filter(Application.student_id == student_id)
+    if position_id is not None:
+        query = query.join(Shortlist, Shortlist.application_id == Application.id)
+        query = query.filter(Shortlist.position_id == position_id)
+    if after is not None:
+        query = query.filter(Application.id > after)
+    return query.order_by(Application.id)
+
+
+def take_page(query, limit):
+    """
+    Run a filter_applications() query for one page. Fetches one extra row
+    to learn whether another page exists.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].id
+    return rows, next_cursor
+
+
+def get_applications_page(limit=DEFAULT_PAGE_SIZE, after=None, status=None,
+                          student_id=None, position_id=None, with_positions=False):
+    """
+    Keyset page of applications ordered by id.
+
+    - after: only applications with id > after are returned (the cursor).
+    - status / student_id / position_id: optional filters, applied in SQL.
+    - with_positions: eager-load shortlists and positions for serialization.
+    Returns (applications, next_cursor); next_cursor is None on the last page.
+    """
+    query = Application.query
+    if with_positions:
+        query = with_shortlist_positions(query)
+    query = filter_applications(query, after, status, student_id, position_id)
+    return take_page(query, limit)
@@ -2,15 +2,31 @@ from flask_jwt_extended import create_access_token, jwt_required, JWTManager, ge
 
 from App.models import User
 from App.database import db
+from .principal import setup_principal_cache, load_principal, route_user
+from .password import verify_password
+from .user import create_user
 
 def login(username, password):
   user = User.query.filter_by(username=username).first()
-  if user and user.check_password(password):
+  # Verified on the password hasher pool so the worker's hub keeps serving
+  if user and verify_password(user.password, password):
     return create_access_token(identity=str(user.id))
   return None
 
+def signup(username, password, user_type, degree=None, gpa=None, email=None):
+  """
+  Create the user and its role row (with degree/GPA/email for students) in one
+  transaction and mint the token from the new id, skipping the second
+  lookup and hash verification a login() would cost.
+  """
+  created = create_user(username, password, user_type, degree=degree, gpa=gpa, email=email)
+  if not created:
+    return None
+  return create_access_token(identity=str(created.user_id))
+
 def setup_jwt(app):
   jwt = JWTManager(app)
+  setup_principal_cache(app)
 
   # Always store a string user id in the JWT identity (sub),
   # whether a User object or a raw id is passed.
@@ -27,7 +43,10 @@ def setup_jwt(app):
       user_id = int(identity)
     except (TypeError, ValueError):
       return None
-    return db.session.get(User, user_id)
+    # A user inside their read-your-writes window reads from the primary
+    route_user(user_id)
+    # Served from the per-worker principal cache; no DB round trip when warm
+    return load_principal(user_id)
 
   return jwt
 
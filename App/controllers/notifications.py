@@ -0,0 +1,257 @@
+import random
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+from flask import current_app
+from sqlalchemy import insert, update
+
+from App.database import db
+from App.models import Application, Student, Position
+from App.models.outbox import NotificationOutbox, OutboxStatus
+
+
+def queue_decision_notifications(decisions, position_id=None):
+    """
+    Write one outbox row per (application_id, decision) in the caller's
+    transaction, as a single executemany INSERT. The caller commits;
+    nothing is sent until the notifier picks the rows up.
+    """
+    if decisions:
+        db.session.execute(insert(NotificationOutbox), [
+            {"application_id": application_id, "decision": decision, "position_id": position_id}
+            for application_id, decision in decisions
+        ])
+
+
+class Notifier:
+    """
+    Drains the notification outbox and delivers decision emails over SMTP.
+
+    Each pass claims a batch of due PENDING rows by pushing their
+    next_attempt_at out by a lease and committing, sends outside any
+    transaction, then records the outcome. A worker that dies mid-batch
+    leaves its rows to be retried once the lease expires, so delivery is
+    at least once. Failed sends back off exponentially with jitter until
+    max_attempts, after which the row is marked FAILED.
+    """
+
+    def __init__(self, app, smtp_host="localhost", smtp_port=25, sender="noreply@localhost",
+                 username=None, password=None, use_tls=False, smtp_timeout=10.0,
+                 batch_size=50, max_attempts=5, backoff=30.0, max_backoff=3600.0,
+                 lease=300.0, poll_interval=5.0):
+        self.app = app
+        self.smtp_host = smtp_host
+        self.smtp_port = smtp_port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.smtp_timeout = smtp_timeout
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+
+    # ---- delivery ----
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=self.smtp_timeout)
+        if self.use_tls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password)
+        return smtp
+
+    def _message(self, recipient, username, decision, title):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = recipient
+        message["Subject"] = f"Your application was {decision.lower()}"
+        position = f" for {title}" if title else ""
+        message.set_content(f"Hi {username},\n\nYour application{position} was {decision.lower()}.\n")
+        return message
+
+    def _retry_delay(self, attempts):
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _due(self, now):
+        """Ids of up to batch_size due PENDING rows, oldest first."""
+        return [entry_id for (entry_id,) in (
+            db.session.query(NotificationOutbox.id)
+            .filter(
+                NotificationOutbox.status == OutboxStatus.PENDING,
+                NotificationOutbox.next_attempt_at <= now
+            )
+            .order_by(NotificationOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )]
+
+    def _lease(self, entry_ids, now):
+        """
+        Conditional UPDATE taking the lease on entry_ids; only rows still
+        due at `now` match, so when two claimers read the same ids (SQLite
+        ignores SKIP LOCKED) the second one's UPDATE changes nothing.
+        Returns the rows this UPDATE changed.
+        """
+        if not entry_ids:
+            db.session.commit()
+            return []
+        table = NotificationOutbox.__table__
+        claimed = db.session.execute(
+            update(table)
+            .where(
+                table.c.id.in_(entry_ids),
+                table.c.status == OutboxStatus.PENDING,
+                table.c.next_attempt_at <= now
+            )
+            .values(next_attempt_at=now + timedelta(seconds=self.lease))
+            .returning(table.c.id, table.c.application_id, table.c.position_id, table.c.decision)
+        ).all()
+        db.session.commit()
+        return sorted(tuple(row) for row in claimed)
+
+    def _claim(self):
+        now = datetime.utcnow()
+        return self._lease(self._due(now), now)
+
+    def drain_once(self):
+        """
+        Deliver one batch. Returns {"delivered": n, "retried": n, "failed": n}.
+        Must run inside an app context.
+        """
+        counts = {"delivered": 0, "retried": 0, "failed": 0}
+        claimed = self._claim()
+        if not claimed:
+            return counts
+
+        recipients = {
+            row.id: (row.email, row.username)
+            for row in db.session.query(Application.id, Student.email, Student.username)
+            .join(Student, Student.id == Application.student_id)
+            .filter(Application.id.in_({c[1] for c in claimed}))
+        }
+        titles = dict(
+            db.session.query(Position.id, Position.title)
+            .filter(Position.id.in_({c[2] for c in claimed if c[2] is not None}))
+            .all()
+        )
+        db.session.commit()
+
+        outcomes = {}
+        smtp = None
+        try:
+            for entry_id, application_id, position_id, decision in claimed:
+                email, username = recipients.get(application_id, (None, None))
+                if not email:
+                    outcomes[entry_id] = (OutboxStatus.FAILED, "Student has no email address")
+                    continue
+                try:
+                    if smtp is None:
+                        smtp = self._connect()
+                    smtp.send_message(self._message(email, username, decision, titles.get(position_id)))
+                    outcomes[entry_id] = (OutboxStatus.DELIVERED, None)
+                except (smtplib.SMTPException, OSError) as e:
+                    outcomes[entry_id] = (OutboxStatus.PENDING, f"{type(e).__name__}: {e}"[:500])
+                    if smtp is not None:
+                        smtp.close()
+                        smtp = None
+        finally:
+            if smtp is not None:
+                try:
+                    smtp.quit()
+                except (smtplib.SMTPException, OSError):
+                    smtp.close()
+
+        now = datetime.utcnow()
+        entries = NotificationOutbox.query.filter(NotificationOutbox.id.in_(outcomes)).all()
+        for entry in entries:
+            status, error = outcomes[entry.id]
+            entry.attempts += 1
+            entry.last_error = error
+            if status == OutboxStatus.DELIVERED:
+                entry.status = status
+                entry.delivered_at = now
+                counts["delivered"] += 1
+            elif status == OutboxStatus.FAILED or entry.attempts >= self.max_attempts:
+                entry.status = OutboxStatus.FAILED
+                counts["failed"] += 1
+            else:
+                entry.next_attempt_at = now + timedelta(seconds=self._retry_delay(entry.attempts))
+                counts["retried"] += 1
+        db.session.commit()
+        return counts
+
+    # ---- background workers ----
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    counts = self.drain_once()
+                    db.session.remove()
+            except Exception:
+                self.app.logger.exception("Notifier pass failed")
+                counts = {}
+            if not any(counts.values()):
+                self._stop.wait(self.poll_interval)
+
+    def start(self, workers=1):
+        self._stop.clear()
+        for i in range(workers):
+            thread = threading.Thread(target=self._work, name=f"notifier-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self._threads
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_forever(self):
+        """Drain in the calling thread until interrupted (flask notify run)."""
+        self._stop.clear()
+        self._work()
+
+
+def setup_notifier(app):
+    """
+    Build the app's Notifier from config and start NOTIFIER_WORKERS
+    background threads (0, the default, starts none; use flask notify run
+    for a dedicated process instead).
+    """
+    config = app.config
+    notifier = Notifier(
+        app,
+        smtp_host=config.get("SMTP_HOST", "localhost"),
+        smtp_port=config.get("SMTP_PORT", 25),
+        sender=config.get("MAIL_SENDER", "noreply@localhost"),
+        username=config.get("SMTP_USERNAME"),
+        password=config.get("SMTP_PASSWORD"),
+        use_tls=config.get("SMTP_USE_TLS", False),
+        smtp_timeout=config.get("SMTP_TIMEOUT", 10.0),
+        batch_size=config.get("NOTIFIER_BATCH_SIZE", 50),
+        max_attempts=config.get("NOTIFIER_MAX_ATTEMPTS", 5),
+        backoff=config.get("NOTIFIER_BACKOFF", 30.0),
+        max_backoff=config.get("NOTIFIER_MAX_BACKOFF", 3600.0),
+        lease=config.get("NOTIFIER_LEASE", 300.0),
+        poll_interval=config.get("NOTIFIER_POLL_INTERVAL", 5.0),
+    )
+    app.extensions["notifier"] = notifier
+    workers = config.get("NOTIFIER_WORKERS", 0)
+    if workers:
+        notifier.start(workers)
+    return notifier
+
+
+def get_notifier():
+    return current_app.extensions.get("notifier")
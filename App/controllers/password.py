@@ -0,0 +1,150 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+def _gevent_threadpool(workers):
+    """
+    A gevent ThreadPool of `workers` native threads when gevent has
+    patched threading. Under a patched threading module a
+    ThreadPoolExecutor would only run greenlets, which still block the hub
+    for the whole hash; the hub's own threadpool is shared with DNS and
+    other blocking calls and would ignore PASSWORD_HASH_WORKERS.
+    """
+    try:
+        from gevent import monkey
+        from gevent.threadpool import ThreadPool
+    except ImportError:
+        return None
+    if not monkey.is_module_patched("threading"):
+        return None
+    return ThreadPool(workers)
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a dedicated pool of native
+    threads, so a login burst does not stall the event loop of a gevent
+    worker. At most workers + queue_size operations may be in flight;
+    callers that cannot get a slot within timeout get PasswordHasherBusy.
+
+    workers=0 hashes inline on the calling thread.
+    """
+
+    def __init__(self, workers=2, queue_size=32, timeout=5.0):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    def _pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    pool = _gevent_threadpool(self.workers)
+                    if pool is None:
+                        pool = ThreadPoolExecutor(
+                            max_workers=self.workers,
+                            thread_name_prefix="password-hasher"
+                        )
+                    self._executor = pool
+        return self._executor
+
+    def _submit(self, fn, *args):
+        if self.workers > 0:
+            pool = self._pool()
+            if isinstance(pool, ThreadPoolExecutor):
+                return pool.submit(fn, *args).result()
+            return pool.spawn(fn, *args).get()
+        return fn(*args)
+
+    def _run(self, fn, *args):
+        queued_at = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PasswordHasherBusy("Password hashing queue is full, try again.")
+        try:
+            timings = {}
+
+            def timed():
+                started_at = time.perf_counter()
+                timings["wait"] = started_at - queued_at
+                try:
+                    return fn(*args)
+                finally:
+                    timings["hash"] = time.perf_counter() - started_at
+
+            return self._submit(timed)
+        finally:
+            self._slots.release()
+            self._record(timings.get("wait", 0.0), timings.get("hash", 0.0))
+
+    def _record(self, wait, hash_time):
+        with self._lock:
+            self.calls += 1
+            self.queue_wait_total += wait
+            self.queue_wait_max = max(self.queue_wait_max, wait)
+            self.hash_time_total += hash_time
+            self.hash_time_max = max(self.hash_time_max, hash_time)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def stats(self):
+        with self._lock:
+            calls = self.calls or 1
+            return {
+                "workers": self.workers,
+                "calls": self.calls,
+                "queue_wait_avg": self.queue_wait_total / calls,
+                "queue_wait_max": self.queue_wait_max,
+                "hash_time_avg": self.hash_time_total / calls,
+                "hash_time_max": self.hash_time_max,
+            }
+
+
+# One pool per worker process, built from the config of the first app
+# that asks for it.
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher():
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                config = current_app.config if has_app_context() else {}
+                _hasher = PasswordHasher(
+                    workers=config.get("PASSWORD_HASH_WORKERS", 2),
+                    queue_size=config.get("PASSWORD_HASH_QUEUE_SIZE", 32),
+                    timeout=config.get("PASSWORD_HASH_TIMEOUT", 5.0),
+                )
+    return _hasher
+
+
+def hash_password(password):
+    return get_password_hasher().hash(password)
+
+
+def verify_password(pwhash, password):
+    return get_password_hasher().verify(pwhash, password)
+
+
+def get_password_hasher_stats():
+    return get_password_hasher().stats()
@@ -1,6 +1,7 @@
 from App.models import Position, Employer
-from App.database import db
+from App.database import db, is_lock_error, retry_on_lock
 
+@retry_on_lock
 def open_position(title,user_id, number_of_positions=1):
     employer = Employer.query.filter_by(user_id=user_id).first()
     if not employer:
@@ -13,6 +14,8 @@ def open_position(title,user_id, number_of_positions=1):
         return new_position
     except Exception as e:
         db.session.rollback()
+        if is_lock_error(e):
+            raise
         return False
 
 
@@ -33,10 +36,27 @@ def get_positions_by_employer_json(user_id):
         return [position.toJSON() for position in positions]
     return []
 
+def reserve_position_slot(position_id, count=1):
+    """
+    Atomically take `count` openings from a position:
+    UPDATE position SET number_of_positions = number_of_positions - :count
+    WHERE id = ? AND number_of_positions >= :count
+    Returns False when not enough openings are left. Caller commits.
+    """
+    updated = (
+        db.session.query(Position)
+        .filter(Position.id == position_id, Position.number_of_positions >= count)
+        .update(
+            {Position.number_of_positions: Position.number_of_positions - count},
+            synchronize_session="fetch"
+        )
+    )
+    return updated == 1
+
+
+@retry_on_lock
 def decrement_position_number(position_id):
-    position = Position.query.get(position_id)
-    if position and position.number > 0:
-        position.number -= 1
+    if reserve_position_slot(position_id):
         db.session.commit()
-        return position.number
+        return db.session.get(Position, position_id).number
     return None
\ No newline at end of file
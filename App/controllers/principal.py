@@ -0,0 +1,153 @@
+import time
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+
+from flask import current_app, g, has_request_context
+
+from App.models import User, Student, Staff, Employer, last_write
+from App.database import db
+from App.replica import reading_replica, use_primary
+
+
+# What an authenticated request needs to know about its caller.
+# The role row ids are None when the user has no such role.
+Principal = namedtuple(
+    "Principal",
+    ["id", "username", "role", "student_id", "staff_id", "employer_id"]
+)
+
+
+class PrincipalCache:
+    """
+    Bounded LRU cache of resolved principals with a TTL, local to one worker.
+
+    Invalidation only reaches the worker that made the change, so the TTL
+    bounds how long other workers can serve a stale principal.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                principal, expires_at = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return principal
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, user_id, principal):
+        with self._lock:
+            self._entries[user_id] = (principal, self.clock() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def setup_principal_cache(app):
+    cache = PrincipalCache(
+        maxsize=app.config.get("PRINCIPAL_CACHE_SIZE", 1024),
+        ttl=app.config.get("PRINCIPAL_CACHE_TTL", 60),
+    )
+    app.extensions["principal_cache"] = cache
+    return cache
+
+
+def get_principal_cache():
+    return current_app.extensions.get("principal_cache")
+
+
+def fetch_principal(user_id):
+    """Resolve a user and its role row ids in a single query."""
+    row = (
+        db.session.query(
+            User.id, User.username, User.role,
+            Student.id, Staff.id, Employer.id
+        )
+        .outerjoin(Student, Student.user_id == User.id)
+        .outerjoin(Staff, Staff.user_id == User.id)
+        .outerjoin(Employer, Employer.user_id == User.id)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if row is None:
+        if reading_replica():
+            # Signed up moments ago; the replica may not have the row yet
+            with use_primary():
+                return fetch_principal(user_id)
+        return None
+    return Principal(*row)
+
+
+def route_user(user_id):
+    """
+    Called with the JWT identity once the token is verified, before the
+    view runs a query: a user who wrote within REPLICA_PIN_SECONDS reads
+    from the primary. The write_pin lookup is one primary-key read on
+    the primary, made only for requests routed to the replica.
+    """
+    window = current_app.extensions.get("replica_pin_seconds") if has_request_context() else None
+    if window is None:
+        return
+    # Writes made under this identity pin it (App/models/write_pin.py)
+    g.replica_user_id = user_id
+    if reading_replica():
+        with use_primary():
+            written_at = last_write(db.session, user_id)
+        if written_at is not None and datetime.utcnow() - written_at < timedelta(seconds=window):
+            g.read_replica = False
+
+
+def load_principal(user_id):
+    cache = get_principal_cache()
+    if cache is None:
+        return fetch_principal(user_id)
+
+    principal = cache.get(user_id)
+    if principal is None:
+        principal = fetch_principal(user_id)
+        if principal is not None:
+            cache.put(user_id, principal)
+    return principal
+
+
+def invalidate_principal(user_id):
+    cache = get_principal_cache()
+    if cache is not None:
+        cache.invalidate(user_id)
+
+
+def get_principal_cache_stats():
+    cache = get_principal_cache()
+    return cache.stats() if cache is not None else {}
@@ -0,0 +1,78 @@
+import re
+
+from flask import current_app
+from sqlalchemy import case, func
+
+from App.database import db
+from App.models import Application, Student, Position
+from App.models.application_status import ApplicationStatus
+
+DEFAULT_TOP_K = 50
+MAX_TOP_K = 500
+
+# Words that say nothing about the field of study
+TITLE_STOP_WORDS = {
+    "and", "the", "for", "of", "intern", "internship", "junior", "senior", "assistant",
+}
+
+
+def title_keywords(title):
+    words = re.findall(r"[a-z0-9]+", (title or "").lower())
+    return [w for w in dict.fromkeys(words) if len(w) >= 3 and w not in TITLE_STOP_WORDS]
+
+
+def candidate_score(position, gpa_weight, degree_weight):
+    """
+    SQL score expression for a student against a position:
+    gpa_weight * GPA + degree_weight * (share of title keywords in the degree).
+    """
+    score = gpa_weight * func.coalesce(Student.gpa, 0.0)
+    keywords = title_keywords(position.title)
+    if keywords and degree_weight:
+        degree = func.lower(func.coalesce(Student.degree, ""))
+        matches = sum(case((degree.like(f"%{word}%"), 1.0), else_=0.0) for word in keywords)
+        score = score + degree_weight * matches / len(keywords)
+    return score
+
+
+def get_top_candidates(position_id, k=DEFAULT_TOP_K, gpa_weight=None, degree_weight=None):
+    """
+    Top-k APPLIED applications for a position, best first.
+
+    Ranking happens in the database as ORDER BY score LIMIT k over the
+    status index, so the engine keeps a bounded top-k sort instead of
+    returning and sorting every application.
+    """
+    position = db.session.get(Position, position_id)
+    if not position:
+        raise ValueError("Position not found.")
+
+    config = current_app.config
+    if gpa_weight is None:
+        gpa_weight = config.get("CANDIDATE_GPA_WEIGHT", 1.0)
+    if degree_weight is None:
+        degree_weight = config.get("CANDIDATE_DEGREE_WEIGHT", 1.0)
+
+    score = candidate_score(position, gpa_weight, degree_weight).label("score")
+    rows = (
+        db.session.query(
+            Application.id, Application.student_id,
+            Student.username, Student.gpa, Student.degree, score
+        )
+        .join(Student, Student.id == Application.student_id)
+        .filter(Application.status == ApplicationStatus.APPLIED)
+        .order_by(score.desc(), Application.id)
+        .limit(k)
+        .all()
+    )
+    return [
+        {
+            "application_id": row.id,
+            "student_id": row.student_id,
+            "username": row.username,
+            "gpa": row.gpa,
+            "degree": row.degree,
+            "score": round(row.score, 4),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,102 @@
+import re
+
+from sqlalchemy import text
+
+from App.database import db
+from App.models.search import (
+    POSITION_SEARCH_TABLE,
+    STUDENT_SEARCH_TABLE,
+    POSITION_TSVECTOR,
+    STUDENT_TSVECTOR,
+)
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+SEARCH_KINDS = ("position", "student")
+
+
+def search_terms(q):
+    """Split a free-text query into plain word tokens (no query syntax)."""
+    return re.findall(r"\w+", (q or "").lower())[:10]
+
+
+def _sqlite_queries(terms, kinds):
+    # Every term must match, each as a prefix: "data eng" finds "Database Engineer"
+    match = " ".join(f'"{term}"*' for term in terms)
+    parts = []
+    if "position" in kinds:
+        parts.append(
+            f"SELECT 'position' AS kind, rowid AS id, title AS title, NULL AS username, NULL AS degree, "
+            f"-bm25({POSITION_SEARCH_TABLE}) AS score "
+            f"FROM {POSITION_SEARCH_TABLE} WHERE {POSITION_SEARCH_TABLE} MATCH :match"
+        )
+    if "student" in kinds:
+        parts.append(
+            f"SELECT 'student' AS kind, rowid AS id, NULL AS title, username, degree, "
+            f"-bm25({STUDENT_SEARCH_TABLE}) AS score "
+            f"FROM {STUDENT_SEARCH_TABLE} WHERE {STUDENT_SEARCH_TABLE} MATCH :match"
+        )
+    return parts, {"match": match}
+
+
+def _postgresql_queries(terms, kinds):
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    parts = []
+    if "position" in kinds:
+        parts.append(
+            f"SELECT 'position' AS kind, id, title, NULL AS username, NULL AS degree, "
+            f"ts_rank({POSITION_TSVECTOR}, to_tsquery('simple', :tsquery)) AS score "
+            f"FROM position WHERE {POSITION_TSVECTOR} @@ to_tsquery('simple', :tsquery)"
+        )
+    if "student" in kinds:
+        parts.append(
+            f"SELECT 'student' AS kind, id, NULL AS title, username, degree, "
+            f"ts_rank({STUDENT_TSVECTOR}, to_tsquery('simple', :tsquery)) AS score "
+            f"FROM student WHERE {STUDENT_TSVECTOR} @@ to_tsquery('simple', :tsquery)"
+        )
+    return parts, {"tsquery": tsquery}
+
+
+def search(q, kinds=SEARCH_KINDS, limit=DEFAULT_SEARCH_LIMIT, page=1):
+    """
+    Ranked full-text search over position titles and student
+    username/degree, best match first. Returns one page of result dicts.
+    """
+    terms = search_terms(q)
+    if not terms or not kinds:
+        return []
+
+    if db.engine.dialect.name == "postgresql":
+        parts, params = _postgresql_queries(terms, kinds)
+    else:
+        parts, params = _sqlite_queries(terms, kinds)
+
+    sql = " UNION ALL ".join(parts) + " ORDER BY score DESC, kind, id LIMIT :limit OFFSET :offset"
+    params.update(limit=limit, offset=(page - 1) * limit)
+    rows = db.session.execute(text(sql), params).mappings().all()
+
+    results = []
+    for row in rows:
+        result = {"type": row["kind"], "id": row["id"], "score": round(row["score"], 4)}
+        if row["kind"] == "position":
+            result["title"] = row["title"]
+        else:
+            result.update(username=row["username"], degree=row["degree"])
+        results.append(result)
+    return results
+
+
+def rebuild_search_index():
+    """Repopulate the SQLite FTS tables from the source tables."""
+    if db.engine.dialect.name != "sqlite":
+        return
+    db.session.execute(text(f"DELETE FROM {POSITION_SEARCH_TABLE}"))
+    db.session.execute(text(
+        f"INSERT INTO {POSITION_SEARCH_TABLE}(rowid, title) SELECT id, title FROM position"
+    ))
+    db.session.execute(text(f"DELETE FROM {STUDENT_SEARCH_TABLE}"))
+    db.session.execute(text(
+        f"INSERT INTO {STUDENT_SEARCH_TABLE}(rowid, username, degree) "
+        f"SELECT id, username, degree FROM student"
+    ))
+    db.session.commit()
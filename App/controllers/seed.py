@@ -0,0 +1,262 @@
+import random
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import bindparam, func, insert, text, update
+
+from App.database import db
+from App.models import User, Student, Employer, Staff, Position, Application, Shortlist
+from App.controllers.password import hash_password
+from App.controllers.search import rebuild_search_index
+from App.controllers.stats import rebuild_stats
+
+SEED_PASSWORD = "seedpass"
+DEFAULT_BATCH_SIZE = 10000
+
+DEGREES = (
+    ("Computer Science", 22), ("Information Technology", 14), ("Software Engineering", 10),
+    ("Electrical Engineering", 8), ("Mechanical Engineering", 7), ("Mathematics", 6),
+    ("Accounting", 6), ("Management Studies", 6), ("Economics", 5), ("Design", 4),
+    ("Biology", 4), ("Chemistry", 3), ("Physics", 3), ("Psychology", 2),
+)
+GENDERS = ("Female", "Male", "Other")
+SENIORITY = ("Intern", "Junior", "Associate", "", "Senior")
+FIELDS = ("Software", "Data", "Mechanical", "Electrical", "Database", "Network", "Cloud",
+          "Security", "Mobile", "Web", "Finance", "Marketing", "Research", "UX", "QA")
+ROLES = ("Engineer", "Developer", "Analyst", "Designer", "Technician", "Administrator", "Consultant")
+
+# Share of applications ending in each status, and the shortlist
+# decision that goes with it (APPLIED has no shortlist row)
+STATUS_MIX = (("APPLIED", 0.50), ("SHORTLISTED", 0.25), ("ACCEPTED", 0.08), ("REJECTED", 0.17))
+DECISION_BY_STATUS = {"SHORTLISTED": "PENDING", "ACCEPTED": "ACCEPTED", "REJECTED": "REJECTED"}
+# Applications are spread over this period
+SEED_EPOCH = datetime(2025, 1, 6, 8, 0)
+SEED_PERIOD = timedelta(days=180)
+
+USER_COLUMNS = ("id", "username", "password", "role")
+STUDENT_COLUMNS = ("id", "user_id", "username", "email", "degree", "gpa", "gender", "dob")
+ROLE_COLUMNS = ("id", "user_id", "username")
+POSITION_COLUMNS = ("id", "title", "number_of_positions", "status", "employer_id", "updated_at")
+APPLICATION_COLUMNS = ("id", "student_id", "status", "created_at", "updated_at")
+SHORTLIST_COLUMNS = ("id", "application_id", "position_id", "staff_id", "status", "created_at", "updated_at")
+
+
+def _timestamp(value):
+    # The format SQLAlchemy stores DateTime in on SQLite; other backends
+    # parse it as a timestamp literal.
+    return value.isoformat(" ", "microseconds")
+
+
+def _next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def _insert(model, columns, rows, batch_size):
+    """
+    Executemany INSERT of row tuples (in columns order) holding plain
+    database values, batch_size rows at a time. On SQLite the tuples go
+    straight to the driver, skipping SQLAlchemy's per-row parameter
+    processing (about four times faster); other backends get a Core
+    insert() so the dialect can batch them into multi-row VALUES.
+    """
+    connection = db.session.connection()
+    table = model.__table__
+    if connection.dialect.name == "sqlite":
+        statement = (
+            f"INSERT INTO {connection.dialect.identifier_preparer.format_table(table)} "
+            f"({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        )
+        execute = lambda batch: connection.exec_driver_sql(statement, batch)
+    else:
+        statement = insert(table)
+        execute = lambda batch: connection.execute(statement, [dict(zip(columns, row)) for row in batch])
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            execute(batch)
+            batch = []
+    if batch:
+        execute(batch)
+
+
+def _advance_sequences(models):
+    """
+    Explicit ids leave PostgreSQL's serial sequences where they were, so
+    the next ORM insert would reuse a seeded id; move each one to its
+    table's max(id). SQLite picks the next rowid from the table itself.
+    """
+    connection = db.session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+    for model in models:
+        table = connection.dialect.identifier_preparer.format_table(model.__table__)
+        connection.execute(
+            text(f"SELECT setval(pg_get_serial_sequence(:table, 'id'), max(id)) FROM {table}"),
+            {"table": table}
+        )
+
+
+def seed(students=0, employers=0, positions=0, applications=0, staff=None,
+         seed_value=0, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Append a synthetic dataset, deterministic for a given seed_value and
+    starting database.
+
+    Rows are written in bulk under explicit ids, so no ORM objects or
+    RETURNING round trips are involved, and every user shares one
+    precomputed hash of SEED_PASSWORD. Employers' position counts are
+    skewed (employer k gets weight 1/k), GPAs are normal around 3.1, and
+    applications follow STATUS_MIX; shortlisted and decided ones get a
+    shortlist row, favouring popular positions, without accepting more
+    students than a position has openings. Rows are generated and written
+    a batch at a time, so memory stays flat however large the dataset.
+    The search index and the stats counters are rebuilt at the end, since
+    bulk inserts bypass their hooks, and PostgreSQL id sequences are moved
+    past the seeded ids. Transition history (application_event) is not
+    generated.
+
+    Returns the number of rows inserted per table.
+    """
+    if applications > students:
+        raise ValueError("Each student can submit only one application; --applications must not exceed --students.")
+    if positions and not employers:
+        raise ValueError("Positions need at least one employer.")
+    if staff is None:
+        staff = max(1, employers // 10) if applications else 0
+    if applications and not positions:
+        raise ValueError("Applications need at least one position to be shortlisted for.")
+    if applications and not staff:
+        raise ValueError("Applications need at least one staff member to shortlist them.")
+
+    if db.engine.dialect.name == "sqlite":
+        # Unique-index inserts on millions of rows thrash the default 2 MB
+        # page cache; 256 MB for this connection only.
+        db.session.connection().exec_driver_sql("PRAGMA cache_size = -262144")
+
+    rng = random.Random(seed_value)
+    password = hash_password(SEED_PASSWORD)
+    user_base = _next_id(User)
+    student_base = _next_id(Student)
+    employer_base = _next_id(Employer)
+    staff_base = _next_id(Staff)
+    position_base = _next_id(Position)
+    application_base = _next_id(Application)
+    shortlist_base = _next_id(Shortlist)
+    employer_user_base = user_base + students
+    staff_user_base = employer_user_base + employers
+
+    def users(base, count, role):
+        return ((base + i, f"{role}{base + i:07d}", password, role) for i in range(count))
+
+    _insert(User, USER_COLUMNS, users(user_base, students, "student"), batch_size)
+    _insert(User, USER_COLUMNS, users(employer_user_base, employers, "employer"), batch_size)
+    _insert(User, USER_COLUMNS, users(staff_user_base, staff, "staff"), batch_size)
+
+    # Columns are drawn a batch at a time with choices(k=n), which costs
+    # a fraction of a per-row choices() call.
+    degrees = [d for d, _ in DEGREES]
+    degree_weights = list(accumulate(w for _, w in DEGREES))
+    birthdays = [(date(1996, 1, 1) + timedelta(days=d)).isoformat() for d in range(3650)]
+    for start in range(0, students, batch_size):
+        n = min(batch_size, students - start)
+        user_ids = range(user_base + start, user_base + start + n)
+        _insert(Student, STUDENT_COLUMNS, [
+            (student_base + user_id - user_base, user_id, f"student{user_id:07d}", f"student{user_id:07d}@example.edu",
+             degree, round(min(4.0, max(1.0, rng.gauss(3.1, 0.45))), 2), gender, dob)
+            for user_id, degree, gender, dob in zip(
+                user_ids,
+                rng.choices(degrees, cum_weights=degree_weights, k=n),
+                rng.choices(GENDERS, k=n),
+                rng.choices(birthdays, k=n),
+            )
+        ], batch_size)
+
+    _insert(Employer, ROLE_COLUMNS, (
+        (employer_base + i, employer_user_base + i, f"employer{employer_user_base + i:07d}") for i in range(employers)
+    ), batch_size)
+    _insert(Staff, ROLE_COLUMNS, (
+        (staff_base + i, staff_user_base + i, f"staff{staff_user_base + i:07d}") for i in range(staff)
+    ), batch_size)
+
+    epoch = _timestamp(SEED_EPOCH)
+    employer_weights = list(accumulate(1.0 / (k + 1) for k in range(employers)))
+    capacity = [rng.randint(1, 10) for _ in range(positions)]
+    _insert(Position, POSITION_COLUMNS, (
+        (
+            position_base + i,
+            " ".join(filter(None, (rng.choice(SENIORITY), rng.choice(FIELDS), rng.choice(ROLES)))),
+            capacity[i], "open",
+            employer_base + rng.choices(range(employers), cum_weights=employer_weights)[0],
+            epoch,
+        )
+        for i in range(positions)
+    ), batch_size)
+
+    # Popularity of each position among shortlisters, also skewed
+    position_weights = list(accumulate(1.0 / (k + 1) ** 0.8 for k in rng.sample(range(positions), positions)))
+    accepted = [0] * positions
+    statuses = [status for status, _ in STATUS_MIX]
+    status_weights = list(accumulate(share for _, share in STATUS_MIX))
+    decision_delays = [timedelta(hours=h) for h in range(1, 24 * 21)]
+    shortlist_delay = timedelta(hours=1)
+    step = SEED_PERIOD / applications if applications else None
+    # Applicants in id order keep the unique student_id index appending
+    applicants = range(students) if applications == students else sorted(rng.sample(range(students), applications))
+    shortlists = 0
+    for start in range(0, applications, batch_size):
+        n = min(batch_size, applications - start)
+        application_batch = []
+        shortlist_batch = []
+        for i, student, status, position, staffer, delay in zip(
+            range(start, start + n),
+            applicants[start:start + n],
+            rng.choices(statuses, cum_weights=status_weights, k=n),
+            rng.choices(range(positions), cum_weights=position_weights, k=n),
+            rng.choices(range(staff), k=n),
+            rng.choices(decision_delays, k=n),
+        ):
+            created = SEED_EPOCH + step * i
+            created_at = updated_at = _timestamp(created)
+            if status != "APPLIED":
+                if status == "ACCEPTED":
+                    if accepted[position] < capacity[position]:
+                        accepted[position] += 1
+                    else:
+                        status = "REJECTED"
+                updated_at = _timestamp(created + delay)
+                shortlist_batch.append((
+                    shortlist_base + shortlists, application_base + i, position_base + position,
+                    staff_base + staffer, DECISION_BY_STATUS[status],
+                    _timestamp(created + shortlist_delay), updated_at,
+                ))
+                shortlists += 1
+            application_batch.append((application_base + i, student_base + student, status, created_at, updated_at))
+        _insert(Application, APPLICATION_COLUMNS, application_batch, batch_size)
+        _insert(Shortlist, SHORTLIST_COLUMNS, shortlist_batch, batch_size)
+
+    # Openings left after the acceptances, as number_of_positions is
+    # decremented by decide()
+    filled = [
+        {"position_id": position_base + i, "openings": capacity[i] - count}
+        for i, count in enumerate(accepted) if count
+    ]
+    if filled:
+        table = Position.__table__
+        db.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("position_id"))
+            .values(number_of_positions=bindparam("openings"), updated_at=SEED_EPOCH),
+            filled
+        )
+    _advance_sequences((User, Student, Employer, Staff, Position, Application, Shortlist))
+    db.session.commit()
+
+    rebuild_search_index()
+    rebuild_stats()
+    db.session.commit()
+    return {
+        "users": students + employers + staff, "students": students, "employers": employers,
+        "staff": staff, "positions": positions, "applications": applications,
+        "shortlists": shortlists,
+    }
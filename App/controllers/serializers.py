@@ -0,0 +1,74 @@
+# Response serializers for list endpoints. Each runs a column-projected
+# query (rows, not ORM instances, so nothing is hydrated or added to the
+# identity map) and returns plain dicts for the app's JSON provider.
+from sqlalchemy import func, select
+from sqlalchemy.orm import aliased
+
+from App.database import db
+from App.models import Application, Position, Shortlist, User
+from App.models.application_status import ApplicationStatus
+from App.controllers.application import DEFAULT_PAGE_SIZE, filter_applications, take_page
+
+
+def position_list(employer_id=None):
+    """Openings as dicts, optionally only those of one employer (employer.id)."""
+    query = db.session.query(
+        Position.id, Position.title, Position.number_of_positions, Position.employer_id
+    )
+    if employer_id is not None:
+        query = query.filter(Position.employer_id == employer_id)
+    return [
+        {
+            "position_id": row.id,
+            "title": row.title,
+            "number_of_positions": row.number_of_positions,
+            "employer_id": row.employer_id,
+        }
+        for row in query.order_by(Position.id)
+    ]
+
+
+def user_list():
+    return [
+        {"id": row.id, "username": row.username}
+        for row in db.session.query(User.id, User.username).order_by(User.id)
+    ]
+
+
+def _first_shortlist_id():
+    return (
+        select(func.min(Shortlist.id))
+        .where(Shortlist.application_id == Application.id)
+        .correlate(Application)
+        .scalar_subquery()
+    )
+
+
+def application_page(limit=DEFAULT_PAGE_SIZE, after=None, status=None,
+                     student_id=None, position_id=None, with_positions=False):
+    """
+    Projected equivalent of get_applications_page(): returns
+    (items, next_cursor) with each item already a response dict.
+    with_positions adds the first shortlisted position (id and title) to
+    applications past APPLIED, joined in the same query.
+    """
+    columns = [Application.id, Application.student_id, Application.status]
+    if with_positions:
+        first = aliased(Shortlist)
+        columns += [Position.id.label("position_id"), Position.title]
+    query = db.session.query(*columns).select_from(Application)
+    if with_positions:
+        query = (
+            query.outerjoin(first, first.id == _first_shortlist_id())
+            .outerjoin(Position, Position.id == first.position_id)
+        )
+    query = filter_applications(query, after, status, student_id, position_id)
+    rows, next_cursor = take_page(query, limit)
+
+    items = []
+    for row in rows:
+        item = {"application_id": row.id, "student_id": row.student_id, "status": row.status.name}
+        if with_positions and row.position_id is not None and row.status != ApplicationStatus.APPLIED:
+            item["position"] = {"position_id": row.position_id, "title": row.title}
+        items.append(item)
+    return items, next_cursor
@@ -0,0 +1,117 @@
+import random
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from App.database import db
+from App.models import Application, Shortlist, PositionStats, ALL_POSITIONS, STATS_SHARDS, STAT_COLUMNS
+from App.models.shortlist import DecisionStatus
+
+# Shortlist decision -> per-position counter column
+DECISION_COLUMNS = {
+    DecisionStatus.PENDING: "shortlisted",
+    DecisionStatus.ACCEPTED: "accepted",
+    DecisionStatus.REJECTED: "rejected",
+}
+
+
+def status_column(status):
+    """Counter column for an ApplicationStatus or DecisionStatus (None passes through)."""
+    if status is None:
+        return None
+    if isinstance(status, DecisionStatus):
+        return DECISION_COLUMNS[status]
+    return status.name.lower()
+
+
+def count_transition(deltas, position_id, old, new, count=1):
+    """
+    Add a status transition of count rows to deltas
+    ({position_id: {column: delta}}); old/new are statuses or None.
+    """
+    row = deltas.setdefault(position_id, {})
+    old, new = status_column(old), status_column(new)
+    if old == new:
+        return deltas
+    if old is not None:
+        row[old] = row.get(old, 0) - count
+    if new is not None:
+        row[new] = row.get(new, 0) + count
+    return deltas
+
+
+def _insert_for_dialect():
+    if db.engine.dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+def adjust_stats(deltas):
+    """
+    Apply counter deltas inside the caller's transaction, one atomic
+    upsert per position row (created on first use). The ALL_POSITIONS
+    delta goes to a random one of its STATS_SHARDS rows. Rows are touched
+    in position_id order so concurrent transactions lock them
+    consistently. The caller commits.
+    """
+    if ALL_POSITIONS in deltas:
+        deltas = dict(deltas)
+        deltas[ALL_POSITIONS - random.randrange(STATS_SHARDS)] = deltas.pop(ALL_POSITIONS)
+    insert = _insert_for_dialect()
+    table = PositionStats.__table__
+    for position_id in sorted(deltas):
+        changes = {column: delta for column, delta in deltas[position_id].items() if delta}
+        if not changes:
+            continue
+        statement = insert(table).values(position_id=position_id, **changes)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.position_id],
+            set_={column: table.c[column] + delta for column, delta in changes.items()},
+        )
+        db.session.execute(statement)
+
+
+def _stats_json(row):
+    return row.toJSON() if row else dict.fromkeys(STAT_COLUMNS, 0)
+
+
+def get_stats():
+    """Application counts by status across all positions (sums the shard rows)."""
+    row = (
+        db.session.query(*[func.coalesce(func.sum(getattr(PositionStats, column)), 0) for column in STAT_COLUMNS])
+        .filter(PositionStats.position_id <= ALL_POSITIONS,
+                PositionStats.position_id > ALL_POSITIONS - STATS_SHARDS)
+        .one()
+    )
+    return dict(zip(STAT_COLUMNS, map(int, row)))
+
+
+def get_position_stats(position_id):
+    """Shortlist counts by decision for one position (one row read)."""
+    stats = _stats_json(db.session.get(PositionStats, position_id))
+    stats.pop("applied")
+    return stats
+
+
+def rebuild_stats():
+    """
+    Recompute every counter from the source tables: one GROUP BY over
+    application.status and one over shortlist (position_id, status).
+    Returns the number of counter rows written.
+    """
+    deltas = {ALL_POSITIONS: {}}
+    for status, count in db.session.query(Application.status, func.count()).group_by(Application.status):
+        count_transition(deltas, ALL_POSITIONS, None, status, count)
+    for position_id, status, count in (
+        db.session.query(Shortlist.position_id, Shortlist.status, func.count())
+        .group_by(Shortlist.position_id, Shortlist.status)
+    ):
+        count_transition(deltas, position_id, None, status, count)
+
+    db.session.execute(delete(PositionStats))
+    db.session.execute(PositionStats.__table__.insert(), [
+        {"position_id": position_id, **dict.fromkeys(STAT_COLUMNS, 0), **counts}
+        for position_id, counts in deltas.items()
+    ])
+    db.session.commit()
+    return len(deltas)
@@ -1,6 +1,16 @@
+import re
+
 from App.models import Shortlist, Position, Staff, Student, Application
 from App.database import db
 
+# Deliberately loose: one @, no spaces, a dot in the domain. Delivery is
+# the real check.
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def valid_email(email):
+    return isinstance(email, str) and len(email) <= 256 and EMAIL_PATTERN.match(email) is not None
+
 
 
 def create_student(username, user_id):
@@ -17,6 +27,25 @@ def add_gpa_to_student(student_id, gpa):
         return student.gpa
     return None
 
+def add_email_to_student(student_id, email):
+    student = Student.query.get(student_id)
+    if student:
+        student.email = email
+        db.session.commit()
+        return student.email
+    return None
+
+def update_student_profile(student_id, **fields):
+    """Set any of email, gpa and degree in one commit; None if no such student."""
+    student = Student.query.get(student_id)
+    if not student:
+        return None
+    for name in ("email", "gpa", "degree"):
+        if name in fields:
+            setattr(student, name, fields[name])
+    db.session.commit()
+    return student
+
 def add_degree_to_student(student_id, degree):
     student = Student.query.get(student_id)
     if student:
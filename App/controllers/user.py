@@ -1,43 +1,53 @@
 from App.models import User, Student, Employer, Staff
-from App.database import db
+from App.database import db, retry_on_lock
+from .principal import invalidate_principal
+from .password import hash_password
 
-def create_user(username, password, user_type,degree=None,gpa=None):
+def create_user(username, password, user_type,degree=None,gpa=None,email=None):
+    # Hashed on the password hasher pool; PasswordHasherBusy propagates (503)
+    password_hash = hash_password(password)
     try:
-        newuser = User(username=username, password=password, role=user_type)
-        db.session.add(newuser)
-        db.session.flush() 
-        
-        student = employer = staff = None
-
-        if user_type == "student":
-            student = Student(username=username, user_id=newuser.id,degree=degree,gpa=gpa)
-            db.session.add(student)
-        elif user_type == "employer":
-            employer = Employer(username=username, user_id=newuser.id)
-            db.session.add(employer)
-        elif user_type == "staff":
-            staff = Staff(username=username, user_id=newuser.id)
-            db.session.add(staff)
-        else:
-            return False
-        
-        db.session.commit()
-
-        if user_type == "student":
-            return student
-        if user_type == "employer":
-            return employer
-        if user_type == "staff":
-            return staff
-
-        return newuser
-
+        return _insert_user(username, password_hash, user_type, degree, gpa, email)
     except Exception as e:
         print("create_user error:", e)
         db.session.rollback()
         return False
 
 
+# Retried apart from create_user so that a lock retry does not hash again
+@retry_on_lock
+def _insert_user(username, password_hash, user_type, degree, gpa, email=None):
+    newuser = User(username=username, password=None, role=user_type,
+                   password_hash=password_hash)
+    db.session.add(newuser)
+    db.session.flush() 
+    
+    student = employer = staff = None
+
+    if user_type == "student":
+        student = Student(username=username, user_id=newuser.id,degree=degree,gpa=gpa,email=email)
+        db.session.add(student)
+    elif user_type == "employer":
+        employer = Employer(username=username, user_id=newuser.id)
+        db.session.add(employer)
+    elif user_type == "staff":
+        staff = Staff(username=username, user_id=newuser.id)
+        db.session.add(staff)
+    else:
+        return False
+    
+    db.session.commit()
+    invalidate_principal(newuser.id)
+
+    if user_type == "student":
+        return student
+    if user_type == "employer":
+        return employer
+    if user_type == "staff":
+        return staff
+
+    return newuser
+
 def get_user_by_username(username):
     result = db.session.execute(db.select(User).filter_by(username=username))
     return result.scalar_one_or_none()
@@ -61,5 +71,6 @@ def update_user(id, username):
         user.username = username
         # user is already in the session; no need to re-add
         db.session.commit()
+        invalidate_principal(user.id)
         return True
     return None
@@ -0,0 +1,51 @@
+from sqlalchemy import func, select
+
+from App.database import db
+from App.models import Application, Position, Shortlist
+
+
+def _stamp(value):
+    return int(value.timestamp() * 1_000_000) if value else 0
+
+
+def positions_etag(employer_id=None):
+    """
+    ETag for a list of openings: the newest position.updated_at plus the
+    row count, one aggregate over position (by employer_id when given).
+    """
+    query = select(func.count(Position.id), func.max(Position.updated_at))
+    if employer_id is not None:
+        query = query.where(Position.employer_id == employer_id)
+    count, newest = db.session.execute(query).one()
+    prefix = "positions" if employer_id is None else f"positions-e{employer_id}"
+    return f"{prefix}-n{count}-{_stamp(newest)}"
+
+
+def application_etag(application_id):
+    """
+    ETag for a single application read, or None when it does not exist.
+    Built from the row's updated_at plus the newest updated_at of its
+    shortlist rows and their positions (the response includes the
+    shortlisted position's title).
+    """
+    shortlist_at = (
+        select(func.max(Shortlist.updated_at))
+        .where(Shortlist.application_id == application_id)
+        .scalar_subquery()
+    )
+    position_at = (
+        select(func.max(Position.updated_at))
+        .join(Shortlist, Shortlist.position_id == Position.id)
+        .where(Shortlist.application_id == application_id)
+        .scalar_subquery()
+    )
+    row = db.session.execute(
+        select(Application.updated_at, shortlist_at.label("shortlist_at"), position_at.label("position_at"))
+        .where(Application.id == application_id)
+    ).first()
+    if row is None:
+        return None
+    return (
+        f"application-{application_id}-{_stamp(row.updated_at)}"
+        f"-s{_stamp(row.shortlist_at)}-p{_stamp(row.position_at)}"
+    )
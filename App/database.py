@@ -1,14 +1,277 @@
+import functools
+import os
+import random
+import time
+
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+
+from App.replica import REPLICA_BIND, RoutingSession, configure_replica
+from App.slow_queries import setup_slow_query_log
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+# Tables managed outside the models (full-text search index and its
+# FTS5 shadow tables); autogenerate must not try to drop them.
+UNMANAGED_TABLE_PREFIXES = ('position_search', 'student_search')
+
+# Applied to every new SQLite connection unless SQLITE_TUNING is False;
+# SQLITE_PRAGMAS overrides individual entries (None drops one).
+SQLITE_PRAGMAS = {
+    # Readers no longer block the writer (or each other), and a commit
+    # appends to the log instead of rewriting pages in place
+    "journal_mode": "WAL",
+    # In WAL mode NORMAL is still crash-safe for the database; only the
+    # last commits before a power loss can roll back
+    "synchronous": "NORMAL",
+    "cache_size": -65536,       # 64 MiB per connection (negative = KiB)
+    "mmap_size": 268435456,     # 256 MiB of the file read through mmap
+    "temp_store": "MEMORY",
+    # How long a writer waits on the lock before "database is locked";
+    # retry_on_lock takes over past it
+    "busy_timeout": 5000,
+    "foreign_keys": "ON",
+}
 
+WRITE_RETRY_ATTEMPTS = 5
+WRITE_RETRY_BACKOFF = 0.02      # seconds; doubles per attempt, full jitter
+WRITE_RETRY_MAX_BACKOFF = 1.0
 
-db = SQLAlchemy()
+# Connections all gunicorn workers may hold on one database server
+# together, below PostgreSQL's default max_connections of 100
+DB_MAX_CONNECTIONS = 80
+# Processes assumed to share it when neither DB_WORKERS nor gunicorn's
+# WEB_CONCURRENCY says; gunicorn_config.py's default worker count
+DB_WORKERS = 4
+DB_POOL_TIMEOUT = 10            # seconds a request waits for a connection
+DB_POOL_RECYCLE = 1800          # reopen connections older than this (seconds)
+
+# PostgreSQL serialization failure and deadlock
+_RETRYABLE_PGCODES = ('40001', '40P01')
+_LOCK_MESSAGES = ('database is locked', 'database table is locked', 'database is busy')
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not name.startswith(UNMANAGED_TABLE_PREFIXES)
+    return True
 
 def get_migrate(app):
-    return Migrate(app, db)
+    return Migrate(app, db, include_name=include_name)
 
 def create_db():
     db.create_all()
-    
+
+def sqlite_pragmas(app):
+    if not app.config.get("SQLITE_TUNING", True):
+        return {}
+    pragmas = dict(SQLITE_PRAGMAS, **app.config.get("SQLITE_PRAGMAS", {}))
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Run PRAGMA name = value for each entry on every new connection."""
+    statements = [f"PRAGMA {name} = {value}" for name, value in pragmas.items()]
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+def is_lock_error(error):
+    """True for lock contention worth retrying the transaction for."""
+    if not isinstance(error, OperationalError):
+        return False
+    if getattr(error.orig, "pgcode", None) in _RETRYABLE_PGCODES:
+        return True
+    message = str(error.orig).lower()
+    return any(text in message for text in _LOCK_MESSAGES)
+
+def retry_on_lock(fn):
+    """
+    Re-run a write controller from the top when its transaction fails on
+    lock contention (SQLite "database is locked", PostgreSQL serialization
+    failures and deadlocks): roll back, sleep a random time up to an
+    exponentially growing bound, try again, at most WRITE_RETRY_ATTEMPTS
+    times (WRITE_RETRY_BACKOFF sets the first bound). The function must
+    do all of its reads and writes in the one transaction it commits.
+    Nested calls run inside the outermost one's retry.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        info = db.session.info
+        if info.get("retry_on_lock"):
+            return fn(*args, **kwargs)
+        config = current_app.config
+        attempts = config.get("WRITE_RETRY_ATTEMPTS", WRITE_RETRY_ATTEMPTS)
+        backoff = config.get("WRITE_RETRY_BACKOFF", WRITE_RETRY_BACKOFF)
+        attempt = 1
+        info["retry_on_lock"] = True
+        try:
+            while True:
+                try:
+                    return fn(*args, **kwargs)
+                except OperationalError as e:
+                    if not is_lock_error(e):
+                        raise
+                    db.session.rollback()
+                    if attempt >= attempts:
+                        raise
+                time.sleep(random.uniform(0, min(WRITE_RETRY_MAX_BACKOFF, backoff * 2 ** (attempt - 1))))
+                attempt += 1
+        finally:
+            info.pop("retry_on_lock", None)
+    return wrapper
+
+def postgres_url(environ):
+    """
+    Database URL from the POSTGRES_* variables render.yaml provides:
+    POSTGRES_URL (the host, optionally host:port, or a full postgres://
+    URL), POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_DB and optionally
+    POSTGRES_PORT. None when POSTGRES_URL is not set.
+    """
+    location = environ.get("POSTGRES_URL")
+    if not location:
+        return None
+    if "://" in location:
+        url = make_url(location)
+    else:
+        host, _, port = location.partition(":")
+        url = URL.create("postgresql", host=host, port=int(port) if port else None)
+    port = environ.get("POSTGRES_PORT")
+    url = url.set(
+        drivername="postgresql+psycopg2",
+        username=environ.get("POSTGRES_USER") or url.username,
+        password=environ.get("POSTGRES_PASSWORD") or url.password,
+        database=environ.get("POSTGRES_DB") or url.database,
+        port=int(port) if port else url.port,
+    )
+    return url.render_as_string(hide_password=False)
+
+def db_workers(app, environ=os.environ):
+    """
+    Worker processes sharing DB_MAX_CONNECTIONS: DB_WORKERS when set,
+    else gunicorn's WEB_CONCURRENCY, else the DB_WORKERS default. Never
+    assumes a single process, which would hand every worker the whole
+    budget.
+    """
+    workers = app.config.get("DB_WORKERS")
+    if workers is None:
+        try:
+            workers = int(environ.get("WEB_CONCURRENCY", DB_WORKERS))
+        except ValueError:
+            workers = DB_WORKERS
+    return max(1, int(workers))
+
+def pool_options(app):
+    """
+    Engine options for server databases. Every worker process gets an
+    equal share of DB_MAX_CONNECTIONS (split over db_workers() processes),
+    half kept open and half as overflow. A gevent worker
+    runs far more requests at once than that, so the pool is what bounds
+    its database concurrency; requests queue for at most DB_POOL_TIMEOUT
+    seconds. DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE and
+    DB_POOL_PRE_PING override the computed values.
+    """
+    config = app.config
+    share = max(2, config.get("DB_MAX_CONNECTIONS", DB_MAX_CONNECTIONS) // db_workers(app))
+    pool_size = config.get("DB_POOL_SIZE", share // 2)
+    return {
+        "pool_size": pool_size,
+        "max_overflow": config.get("DB_MAX_OVERFLOW", max(0, share - pool_size)),
+        "pool_timeout": config.get("DB_POOL_TIMEOUT", DB_POOL_TIMEOUT),
+        "pool_recycle": config.get("DB_POOL_RECYCLE", DB_POOL_RECYCLE),
+        # Drops connections the server or a proxy closed while idle
+        "pool_pre_ping": config.get("DB_POOL_PRE_PING", True),
+    }
+
+def gevent_wait_callback(conn, timeout=None):
+    """
+    psycopg2 wait callback that waits on the connection's socket through
+    the gevent hub (as psycogreen does), so other greenlets run while a
+    query is in flight.
+    """
+    import psycopg2
+    from psycopg2 import extensions
+    from gevent.socket import wait_read, wait_write
+
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            break
+        elif state == extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise psycopg2.OperationalError(f"Bad result from poll: {state!r}")
+
+def install_gevent_wait_callback():
+    """
+    Make psycopg2 cooperative when gevent has monkey-patched the process
+    (gunicorn's gevent workers do, before loading the app). Without it
+    every query blocks all greenlets on the worker until it returns.
+    """
+    try:
+        from gevent import monkey
+        from psycopg2 import extensions
+    except ImportError:
+        return False
+    if not monkey.is_module_patched("socket"):
+        return False
+    extensions.set_wait_callback(gevent_wait_callback)
+    return True
+
+def pool_stats(engine):
+    """Connections in use, idle and allowed for a QueuePool; None for other pools."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    size, max_overflow = pool.size(), pool._max_overflow
+    in_use = pool.checkedout()
+    capacity = size + max_overflow if max_overflow >= 0 else None
+    return {
+        "size": size,
+        "max_overflow": max_overflow,
+        "in_use": in_use,
+        "idle": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "capacity": capacity,
+        "saturation": in_use / capacity if capacity else None,
+    }
+
 def init_db(app):
-    db.init_app(app)
\ No newline at end of file
+    configure_replica(app)
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI")
+    if uri and make_url(uri).get_backend_name() != "sqlite":
+        options = app.config["SQLALCHEMY_ENGINE_OPTIONS"] = dict(pool_options(app), **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+        app.logger.info(
+            "Database pool: %s + %s overflow connections per worker (%s workers, pid %s)",
+            options["pool_size"], options["max_overflow"], db_workers(app), os.getpid()
+        )
+    db.init_app(app)
+    # No model maps to the replica bind; it only routes reads. db is shared
+    # by every app, so the MetaData init_app made for it would otherwise
+    # outlive this app and send create_all() to a bind later apps lack.
+    db.metadatas.pop(REPLICA_BIND, None)
+    with app.app_context():
+        pragmas = sqlite_pragmas(app)
+        for key, engine in db.engines.items():
+            if engine.dialect.name == "postgresql":
+                install_gevent_wait_callback()
+            if engine.dialect.name != "sqlite":
+                continue
+            if key == REPLICA_BIND:
+                # Refuse writes that were routed to the replica by mistake
+                install_sqlite_pragmas(engine, dict(pragmas, query_only="ON"))
+            elif pragmas:
+                install_sqlite_pragmas(engine, pragmas)
+        setup_slow_query_log(app, db.engines.values())
@@ -0,0 +1,38 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib provider is used without it
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson. jsonify() and app.json.dumps()
+    go through it; responses are built straight from orjson's bytes.
+    Keys are emitted in insertion order (no sort_keys) and output is never
+    pretty-printed.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.options).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.options)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json(app):
+    """
+    Install the fastest available JSON provider. JSON_PROVIDER="std" forces
+    Flask's stdlib provider; otherwise orjson is used when installed.
+    """
+    if orjson is not None and app.config.get("JSON_PROVIDER", "orjson") != "std":
+        app.json = OrjsonProvider(app)
+    return app.json
@@ -1,11 +1,13 @@
 import os
-from flask import Flask, render_template
+from flask import Flask, render_template, jsonify
 from flask_uploads import DOCUMENTS, IMAGES, TEXT, UploadSet, configure_uploads
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import  FileStorage
 
 from App.database import init_db
+from App.json_provider import init_json
+from App.metrics import init_metrics
 from App.config import load_config
 
 
@@ -13,6 +15,8 @@ from App.controllers import (
     setup_jwt,
     add_auth_context
 )
+from App.controllers.password import PasswordHasherBusy
+from App.controllers.notifications import setup_notifier
 
 from App.views import views #setup_admin
 
@@ -25,17 +29,24 @@ def add_views(app):
 def create_app(overrides={}):
     app = Flask(__name__, static_url_path='/static')
     load_config(app, overrides)
+    init_json(app)
     CORS(app)
     add_auth_context(app)
     photos = UploadSet('photos', TEXT + DOCUMENTS + IMAGES)
     configure_uploads(app, photos)
     add_views(app)
     init_db(app)
+    setup_notifier(app)
+    init_metrics(app)
     jwt = setup_jwt(app)
     #setup_admin(app)
     @jwt.invalid_token_loader
     @jwt.unauthorized_loader
     def custom_unauthorized_response(error):
         return render_template('401.html', error=error), 401
+
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(error):
+        return jsonify(message=str(error)), 503
     app.app_context().push()
     return app
\ No newline at end of file
@@ -0,0 +1,289 @@
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from App.database import db, pool_stats
+from App.slow_queries import write_json_atomic
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+HELP = {
+    "http_requests_total": ("counter", "Requests by endpoint, method and status."),
+    "http_request_duration_seconds": ("histogram", "Request latency by endpoint."),
+    "http_request_sql_statements": ("histogram", "SQL statements executed per request."),
+    "http_request_sql_seconds": ("histogram", "Time spent in SQL per request."),
+    "sql_statements_total": ("counter", "SQL statements by endpoint (background work is endpoint=\"none\")."),
+    "sql_seconds_total": ("counter", "Time spent in SQL by endpoint."),
+    "db_pool_checkout_wait_seconds": ("histogram", "Time waiting for a pooled connection."),
+    "principal_cache_hits_total": ("counter", "JWT principal cache hits."),
+    "principal_cache_misses_total": ("counter", "JWT principal cache misses."),
+    "principal_cache_hit_ratio": ("gauge", "JWT principal cache hits / lookups, across workers."),
+    "db_pool_connections_in_use": ("gauge", "Pooled connections checked out, by bind."),
+    "db_pool_connections_idle": ("gauge", "Pooled connections open and idle, by bind."),
+    "db_pool_capacity": ("gauge", "Pool size plus overflow, by bind."),
+    "db_pool_saturation": ("gauge", "Connections in use / capacity, by bind, across workers."),
+}
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms. Every series is a sum, so the
+    snapshots of several worker processes merge by adding them up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name, labels=(), value=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value, buckets):
+        key = (name, labels)
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = {
+                    "buckets": list(buckets), "counts": [0] * (len(buckets) + 1), "sum": 0.0
+                }
+            series["counts"][bisect_left(buckets, value)] += 1
+            series["sum"] += value
+
+    def snapshot(self):
+        """JSON-serializable copy of every series."""
+        with self._lock:
+            return {
+                "counters": [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                "histograms": [
+                    [name, list(labels), series["buckets"], list(series["counts"]), series["sum"]]
+                    for (name, labels), series in self._histograms.items()
+                ],
+            }
+
+
+def merge_snapshots(snapshots):
+    counters = {}
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot.get("counters", []):
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, buckets, counts, total in snapshot.get("histograms", []):
+            key = (name, tuple(map(tuple, labels)))
+            series = histograms.get(key)
+            if series is None or series["buckets"] != buckets:
+                histograms[key] = {"buckets": buckets, "counts": list(counts), "sum": total}
+            else:
+                series["counts"] = [a + b for a, b in zip(series["counts"], counts)]
+                series["sum"] += total
+    return counters, histograms
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def render_prometheus(counters, histograms):
+    """Prometheus text exposition format (version 0.0.4)."""
+    hits = sum(v for (n, _), v in counters.items() if n == "principal_cache_hits_total")
+    misses = sum(v for (n, _), v in counters.items() if n == "principal_cache_misses_total")
+    gauges = {("principal_cache_hit_ratio", ()): hits / (hits + misses) if hits + misses else 0.0}
+    in_use = {labels: v for (n, labels), v in counters.items() if n == "db_pool_connections_in_use"}
+    for (name, labels), capacity in counters.items():
+        if name == "db_pool_capacity":
+            gauges[("db_pool_saturation", labels)] = in_use.get(labels, 0) / capacity if capacity else 0.0
+
+    by_name = {}
+    for (name, labels), value in list(counters.items()) + list(gauges.items()):
+        by_name.setdefault(name, []).append(f"{name}{_format_labels(labels)} {value}")
+    for (name, labels), series in histograms.items():
+        lines = by_name.setdefault(name, [])
+        cumulative = 0
+        for bound, count in zip(series["buckets"] + ["+Inf"], series["counts"]):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {series['sum']}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+    output = []
+    for name in sorted(by_name):
+        kind, help_text = HELP.get(name, ("untyped", name))
+        output.append(f"# HELP {name} {help_text}")
+        output.append(f"# TYPE {name} {kind}")
+        output.extend(by_name[name])
+    return "\n".join(output) + "\n"
+
+
+class Metrics:
+    """
+    Request, SQL and pool instrumentation for one app in one process.
+
+    With METRICS_DIR set, each worker process writes its snapshot to
+    METRICS_DIR/metrics-<pid>.json at most every METRICS_FLUSH_INTERVAL
+    seconds, and /metrics sums every worker's file, so any gunicorn worker
+    can serve the whole picture.
+    """
+
+    def __init__(self, app, directory=None, flush_interval=5.0):
+        self.app = app
+        self.registry = MetricsRegistry()
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._flushed_at = 0.0
+        self.engines = {}
+
+    # ---- hooks ----
+
+    def before_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_sql_count = 0
+        g.metrics_sql_time = 0.0
+
+    def after_request(self, response):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = request.url_rule.endpoint if request.url_rule else "unmatched"
+        labels = (("endpoint", endpoint),)
+        registry = self.registry
+        registry.inc("http_requests_total", labels + (("method", request.method), ("status", str(response.status_code))))
+        registry.observe("http_request_duration_seconds", labels, elapsed, REQUEST_BUCKETS)
+        registry.observe("http_request_sql_statements", labels, g.metrics_sql_count, SQL_COUNT_BUCKETS)
+        registry.observe("http_request_sql_seconds", labels, g.metrics_sql_time, REQUEST_BUCKETS)
+        self.maybe_flush()
+        return response
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["metrics_query_started"] = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("metrics_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        endpoint = "none"
+        if has_request_context():
+            g.metrics_sql_count = g.get("metrics_sql_count", 0) + 1
+            g.metrics_sql_time = g.get("metrics_sql_time", 0.0) + elapsed
+            endpoint = request.url_rule.endpoint if request.url_rule else "unmatched"
+        labels = (("endpoint", endpoint),)
+        self.registry.inc("sql_statements_total", labels)
+        self.registry.inc("sql_seconds_total", labels, elapsed)
+
+    def instrument_pool(self, pool):
+        # QueuePool blocks inside _do_get while the pool is exhausted;
+        # timing it measures checkout wait without touching the hot path
+        # of an idle pool beyond two clock reads. Pools offer no event
+        # before a checkout, so the wrapper goes on each pool instance and
+        # engine_disposed re-applies it to the pool dispose() recreates.
+        if getattr(pool, "_metrics_instrumented", False):
+            return
+        do_get = pool._do_get
+        observe = self.registry.observe
+
+        def timed_do_get():
+            started = time.perf_counter()
+            try:
+                return do_get()
+            finally:
+                observe("db_pool_checkout_wait_seconds", (), time.perf_counter() - started, POOL_WAIT_BUCKETS)
+
+        pool._do_get = timed_do_get
+        pool._metrics_instrumented = True
+
+    def engine_disposed(self, engine):
+        self.instrument_pool(engine.pool)
+
+    # ---- export ----
+
+    def snapshot(self):
+        snapshot = self.registry.snapshot()
+        cache = self.app.extensions.get("principal_cache")
+        if cache is not None:
+            stats = cache.stats()
+            snapshot["counters"].append(["principal_cache_hits_total", [], stats["hits"]])
+            snapshot["counters"].append(["principal_cache_misses_total", [], stats["misses"]])
+        # Pool gauges are sums too: connections across every worker
+        for bind, engine in self.engines.items():
+            stats = pool_stats(engine)
+            if stats is None or stats["capacity"] is None:
+                continue
+            labels = [["bind", bind]]
+            snapshot["counters"].append(["db_pool_connections_in_use", labels, stats["in_use"]])
+            snapshot["counters"].append(["db_pool_connections_idle", labels, stats["idle"]])
+            snapshot["counters"].append(["db_pool_capacity", labels, stats["capacity"]])
+        return snapshot
+
+    def _path(self):
+        return os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+
+    def flush(self):
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        write_json_atomic(self._path(), self.snapshot())
+        self._flushed_at = time.monotonic()
+
+    def maybe_flush(self):
+        if self.directory and time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def collect(self):
+        """This process's snapshot merged with every other worker's last flush."""
+        snapshots = [self.snapshot()]
+        if self.directory:
+            own = self._path()
+            for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+                if path == own:
+                    continue
+                try:
+                    with open(path) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return render_prometheus(*merge_snapshots(snapshots))
+
+
+def init_metrics(app):
+    """
+    Hook request and SQL instrumentation into app. METRICS_ENABLED=False
+    turns it off; METRICS_DIR enables the cross-worker merge. /metrics
+    itself stays 404 until METRICS_TOKEN is set.
+    """
+    if not app.config.get("METRICS_ENABLED", True):
+        return None
+    metrics = Metrics(
+        app,
+        directory=app.config.get("METRICS_DIR"),
+        flush_interval=app.config.get("METRICS_FLUSH_INTERVAL", 5.0),
+    )
+    app.before_request(metrics.before_request)
+    app.after_request(metrics.after_request)
+    with app.app_context():
+        for key, engine in db.engines.items():
+            metrics.engines[key or "primary"] = engine
+            event.listen(engine, "before_cursor_execute", metrics.before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", metrics.after_cursor_execute)
+            event.listen(engine, "engine_disposed", metrics.engine_disposed)
+            metrics.instrument_pool(engine.pool)
+    app.extensions["metrics"] = metrics
+    return metrics
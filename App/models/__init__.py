@@ -4,4 +4,9 @@ from .staff import *
 from .employer import *
 from .position import *
 from .shortlist import *
-from .application import *
\ No newline at end of file
+from .application_event import *
+from .application import *
+from .search import *
+from .position_stats import *
+from .outbox import *
+from .write_pin import *
@@ -1,10 +1,11 @@
 # App/models/application.py
 from App.database import db
 from sqlalchemy import Enum
-from sqlalchemy.orm import reconstructor
+from sqlalchemy.orm import object_session
 from datetime import datetime
 
 from App.models.application_status import ApplicationStatus
+from App.models.application_event import record_event
 from App.models.states import (
     ApplicationState,
     AppliedState,
@@ -14,16 +15,35 @@ from App.models.states import (
 )
 
 
+# Precomputed transition table: status -> shared state instance
+APPLIED_STATE = AppliedState()
+STATE_BY_STATUS = {
+    ApplicationStatus.APPLIED: APPLIED_STATE,
+    ApplicationStatus.SHORTLISTED: ShortlistedState(),
+    ApplicationStatus.ACCEPTED: AcceptedState(),
+    ApplicationStatus.REJECTED: RejectedState(),
+}
+
+
 class Application(db.Model):
     __tablename__ = 'application'
 
     id = db.Column(db.Integer, primary_key=True)
-    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
+    # One application per student, enforced by a unique index so the
+    # duplicate check is an index probe rather than a table scan.
+    student_id = db.Column(
+        db.Integer,
+        db.ForeignKey('student.id'),
+        nullable=False,
+        unique=True,
+        index=True
+    )
 
     status = db.Column(
         Enum(ApplicationStatus, native_enum=False),
         nullable=False,
-        default=ApplicationStatus.APPLIED
+        default=ApplicationStatus.APPLIED,
+        index=True
     )
 
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -37,9 +57,6 @@ class Application(db.Model):
     # relationships
     student = db.relationship('Student', backref=db.backref('applications', lazy=True))
 
-    # State pattern runtime object
-    _state = None
-
     def __init__(self, student_id, status=ApplicationStatus.APPLIED, **kwargs):
         super().__init__(**kwargs)
 
@@ -50,43 +67,37 @@ class Application(db.Model):
         else:
             self.status = ApplicationStatus(status)
 
-        self._init_state_from_status()
+    @property
+    def _state(self):
+        # Shared flyweight looked up from the status; loaded rows carry no
+        # state object and no back-reference.
+        return STATE_BY_STATUS.get(self.status, APPLIED_STATE)
 
-    @reconstructor
-    def init_on_load(self):
-        self._init_state_from_status()
-
-    def _init_state_from_status(self):
-        mapping = {
-            ApplicationStatus.APPLIED: AppliedState,
-            ApplicationStatus.SHORTLISTED: ShortlistedState,
-            ApplicationStatus.ACCEPTED: AcceptedState,
-            ApplicationStatus.REJECTED: RejectedState,
-        }
-        state_cls = mapping.get(self.status, AppliedState)
-        self._state = state_cls()
-        self._state.setContext(self)
+    # User making the transition in progress, recorded on its event
+    _actor_user_id = None
 
     def changeState(self, new_state: ApplicationState):
-        self._state = new_state
-        self._state.setContext(self)
+        previous = self.status
         self.status = new_state.status_value
+        # Queued, not executed: written with the status UPDATE in the next
+        # flush of the session that owns this row, batched with any other
+        # queued events. A transient application has no row to log against.
+        session = object_session(self)
+        if session is not None:
+            record_event(session, self, previous, self.status, self._actor_user_id)
 
     # ---- state API ----
-    def shortlist(self):
-        if self._state is None:
-            self._init_state_from_status()
-        self._state.shortlist()
-
-    def accept(self):
-        if self._state is None:
-            self._init_state_from_status()
-        self._state.accept()
-
-    def reject(self):
-        if self._state is None:
-            self._init_state_from_status()
-        self._state.reject()
+    def shortlist(self, actor_user_id=None):
+        self._actor_user_id = actor_user_id
+        self._state.shortlist(self)
+
+    def accept(self, actor_user_id=None):
+        self._actor_user_id = actor_user_id
+        self._state.accept(self)
+
+    def reject(self, actor_user_id=None):
+        self._actor_user_id = actor_user_id
+        self._state.reject(self)
 
     def toJSON(self):
         return {
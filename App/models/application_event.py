@@ -0,0 +1,84 @@
+# App/models/application_event.py
+from App.database import db
+from sqlalchemy import Enum, event, insert
+from sqlalchemy.orm import Session
+from datetime import datetime
+
+from App.models.application_status import ApplicationStatus
+
+__all__ = ["ApplicationEvent", "record_event"]
+
+
+class ApplicationEvent(db.Model):
+    """
+    Append-only audit log of application state transitions. Transitions
+    are queued with record_event() and written in the same flush as the
+    status update.
+    """
+    __tablename__ = 'application_event'
+    __table_args__ = (
+        # History reads: WHERE application_id = ? ORDER BY created_at
+        db.Index('ix_application_event_application_id_created_at', 'application_id', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('application.id'), nullable=False)
+    from_status = db.Column(Enum(ApplicationStatus, native_enum=False), nullable=True)
+    to_status = db.Column(Enum(ApplicationStatus, native_enum=False), nullable=False)
+    # User who made the transition (staff for shortlists, employer for decisions)
+    actor_user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    application = db.relationship('Application')
+
+    def __init__(self, application, from_status, to_status, actor_user_id=None):
+        self.application = application
+        self.from_status = from_status
+        self.to_status = to_status
+        self.actor_user_id = actor_user_id
+
+    def toJSON(self):
+        return {
+            "id": self.id,
+            "application_id": self.application_id,
+            "from": self.from_status.name if self.from_status else None,
+            "to": self.to_status.name,
+            "actor_user_id": self.actor_user_id,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+@event.listens_for(ApplicationEvent, "before_update")
+@event.listens_for(ApplicationEvent, "before_delete")
+def _append_only(mapper, connection, target):
+    raise ValueError("Application events are append-only.")
+
+
+def record_event(session, application, from_status, to_status, actor_user_id=None):
+    """Queue a transition for the session's next flush."""
+    session.info.setdefault('pending_events', []).append(
+        (application, from_status, to_status, actor_user_id, datetime.utcnow())
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _write_pending_events(session, flush_context):
+    # One executemany without RETURNING (the ids are never read back), so
+    # the driver can send every queued event in a single batch.
+    pending = session.info.pop('pending_events', None)
+    if pending:
+        session.connection().execute(insert(ApplicationEvent.__table__), [
+            {
+                "application_id": application.id,
+                "from_status": from_status,
+                "to_status": to_status,
+                "actor_user_id": actor_user_id,
+                "created_at": created_at,
+            }
+            for application, from_status, to_status, actor_user_id, created_at in pending
+        ])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_events(session):
+    session.info.pop('pending_events', None)
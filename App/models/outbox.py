@@ -0,0 +1,59 @@
+# App/models/outbox.py
+from App.database import db
+from sqlalchemy import Enum as SAEnum
+from datetime import datetime
+import enum
+
+
+class OutboxStatus(enum.Enum):
+    PENDING = "PENDING"
+    DELIVERED = "DELIVERED"
+    FAILED = "FAILED"
+
+
+class NotificationOutbox(db.Model):
+    """
+    Transactional outbox: a row is written in the same commit as the
+    decision it announces and delivered later by the notifier, so the
+    request never waits on SMTP and a rolled-back decision sends nothing.
+    """
+    __tablename__ = 'notification_outbox'
+    __table_args__ = (
+        # Drain query: WHERE status = 'PENDING' AND next_attempt_at <= now
+        db.Index('ix_notification_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('application.id'), nullable=False)
+    position_id = db.Column(db.Integer, nullable=True)
+    # Decision being announced (ACCEPTED / REJECTED)
+    decision = db.Column(db.String(20), nullable=False)
+
+    status = db.Column(
+        SAEnum(OutboxStatus, native_enum=False),
+        nullable=False,
+        default=OutboxStatus.PENDING
+    )
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    delivered_at = db.Column(db.DateTime)
+
+    def __init__(self, application_id, decision, position_id=None):
+        self.application_id = application_id
+        self.decision = decision
+        self.position_id = position_id
+
+    def toJSON(self):
+        return {
+            "id": self.id,
+            "application_id": self.application_id,
+            "position_id": self.position_id,
+            "decision": self.decision,
+            "status": self.status.value if self.status else None,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "delivered_at": self.delivered_at.isoformat() if self.delivered_at else None,
+        }
@@ -1,6 +1,7 @@
 from App.database import db
 from sqlalchemy import Enum
 import enum
+from datetime import datetime
 
 class PositionStatus(enum.Enum):
     open = "open"
@@ -11,8 +12,9 @@ class Position(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     number_of_positions = db.Column(db.Integer, default=1)
-    status = db.Column(Enum(PositionStatus, native_enum=False), nullable=False, default=PositionStatus.open)
-    employer_id = db.Column(db.Integer, db.ForeignKey('employer.id'), nullable=False)
+    status = db.Column(Enum(PositionStatus, native_enum=False), nullable=False, default=PositionStatus.open, index=True)
+    employer_id = db.Column(db.Integer, db.ForeignKey('employer.id'), nullable=False, index=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     employer = db.relationship("Employer", back_populates="positions")
 
     def __init__(self, title, employer_id, number):
@@ -0,0 +1,46 @@
+# App/models/position_stats.py
+from sqlalchemy import DDL, event
+
+from App.database import db
+
+__all__ = ["PositionStats", "ALL_POSITIONS", "STATS_SHARDS", "STAT_COLUMNS"]
+
+# position_id of the row counting every application by status. Writes
+# spread that count over STATS_SHARDS rows, ALL_POSITIONS down to
+# ALL_POSITIONS - STATS_SHARDS + 1, so concurrent transitions rarely
+# queue on the same row; reads sum them.
+ALL_POSITIONS = 0
+STATS_SHARDS = 16
+
+STAT_COLUMNS = ("applied", "shortlisted", "accepted", "rejected")
+
+
+class PositionStats(db.Model):
+    """
+    Status counters maintained by the application controllers in the same
+    transaction as each transition.
+
+    - Rows ALL_POSITIONS and the STATS_SHARDS - 1 below it together
+      count every application by status.
+    - Row <position.id> counts that position's shortlist entries by
+      decision (shortlisted = still pending); applied stays 0 there, since
+      an application has no position until it is shortlisted.
+    No FK on position_id so the ALL_POSITIONS shard rows can exist.
+    """
+    __tablename__ = 'position_stats'
+
+    position_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    applied = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    shortlisted = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    accepted = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rejected = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    def toJSON(self):
+        return {column: getattr(self, column) for column in STAT_COLUMNS}
+
+
+event.listen(
+    PositionStats.__table__,
+    "after_create",
+    DDL(f"INSERT INTO position_stats (position_id) VALUES ({ALL_POSITIONS})")
+)
@@ -0,0 +1,86 @@
+# Full-text search index for positions and student profiles.
+#
+# SQLite: FTS5 tables keyed by the source row id, kept current by the
+# mapper hooks below (bulk Core writes bypass them; rebuild with
+# `flask search rebuild`).
+# PostgreSQL: GIN expression indexes over to_tsvector, which the database
+# maintains itself.
+from sqlalchemy import DDL, event, inspect, text
+
+from App.models.position import Position
+from App.models.student import Student
+
+__all__ = ["POSITION_SEARCH_TABLE", "STUDENT_SEARCH_TABLE", "SEARCH_TABLES"]
+
+POSITION_SEARCH_TABLE = "position_search"
+STUDENT_SEARCH_TABLE = "student_search"
+SEARCH_TABLES = (POSITION_SEARCH_TABLE, STUDENT_SEARCH_TABLE)
+
+# Text vectors used by the PostgreSQL indexes and queries; they must match
+# exactly for the planner to use the indexes.
+POSITION_TSVECTOR = "to_tsvector('simple', title)"
+STUDENT_TSVECTOR = "to_tsvector('simple', coalesce(username, '') || ' ' || coalesce(degree, ''))"
+
+SQLITE_CREATE = {
+    POSITION_SEARCH_TABLE:
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {POSITION_SEARCH_TABLE} USING fts5(title)",
+    STUDENT_SEARCH_TABLE:
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {STUDENT_SEARCH_TABLE} USING fts5(username, degree)",
+}
+POSTGRESQL_CREATE = {
+    POSITION_SEARCH_TABLE:
+        f"CREATE INDEX IF NOT EXISTS ix_position_title_fts ON position USING gin ({POSITION_TSVECTOR})",
+    STUDENT_SEARCH_TABLE:
+        f"CREATE INDEX IF NOT EXISTS ix_student_profile_fts ON student USING gin ({STUDENT_TSVECTOR})",
+}
+
+
+for table, name in ((Position.__table__, POSITION_SEARCH_TABLE), (Student.__table__, STUDENT_SEARCH_TABLE)):
+    event.listen(table, "after_create", DDL(SQLITE_CREATE[name]).execute_if(dialect="sqlite"))
+    event.listen(table, "after_create", DDL(POSTGRESQL_CREATE[name]).execute_if(dialect="postgresql"))
+    event.listen(table, "before_drop", DDL(f"DROP TABLE IF EXISTS {name}").execute_if(dialect="sqlite"))
+
+
+def _index_position(connection, target):
+    connection.execute(
+        text(f"INSERT INTO {POSITION_SEARCH_TABLE}(rowid, title) VALUES (:id, :title)"),
+        {"id": target.id, "title": target.title},
+    )
+
+
+def _index_student(connection, target):
+    connection.execute(
+        text(f"INSERT INTO {STUDENT_SEARCH_TABLE}(rowid, username, degree) VALUES (:id, :username, :degree)"),
+        {"id": target.id, "username": target.username, "degree": target.degree},
+    )
+
+
+def _unindex(connection, table, row_id):
+    connection.execute(text(f"DELETE FROM {table} WHERE rowid = :id"), {"id": row_id})
+
+
+def _changed(target, *attrs):
+    state = inspect(target)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+def _register(model, table, index, attrs):
+    @event.listens_for(model, "after_insert")
+    def after_insert(mapper, connection, target):
+        if connection.dialect.name == "sqlite":
+            index(connection, target)
+
+    @event.listens_for(model, "after_update")
+    def after_update(mapper, connection, target):
+        if connection.dialect.name == "sqlite" and _changed(target, *attrs):
+            _unindex(connection, table, target.id)
+            index(connection, target)
+
+    @event.listens_for(model, "after_delete")
+    def after_delete(mapper, connection, target):
+        if connection.dialect.name == "sqlite":
+            _unindex(connection, table, target.id)
+
+
+_register(Position, POSITION_SEARCH_TABLE, _index_position, ("title",))
+_register(Student, STUDENT_SEARCH_TABLE, _index_student, ("username", "degree"))
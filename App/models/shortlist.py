@@ -13,11 +13,16 @@ class DecisionStatus(enum.Enum):
 
 class Shortlist(db.Model):
     __tablename__ = 'shortlist'
+    __table_args__ = (
+        # Serves position_id lookups and the employer's pending-decision
+        # filter (position_id, status) from one index.
+        db.Index('ix_shortlist_position_id_status', 'position_id', 'status'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
     # Link to the application (student application, no position here)
-    application_id = db.Column(db.Integer, db.ForeignKey('application.id'), nullable=False)
+    application_id = db.Column(db.Integer, db.ForeignKey('application.id'), nullable=False, index=True)
 
     # Position this application is being considered for
     position_id = db.Column(db.Integer, db.ForeignKey('position.id'), nullable=False)
@@ -33,6 +38,12 @@ class Shortlist(db.Model):
     )
 
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow
+    )
 
     # Relationships
     application = db.relationship(
@@ -1,29 +1,37 @@
 # Application state interface and base class for State Pattern
 
-from abc import ABC, abstractmethod
+from abc import ABC
 
 class InvalidTransitionError(Exception):
     pass
 
 class ApplicationState(ABC):
-
-    def __init__(self):
-        self.context = None
-
-    def setContext(self, context):
-        self.context = context
-
-    def accept(self):
+    """
+    States are stateless flyweights: each concrete class has one shared
+    instance, and the Application (context) is passed into each transition
+    instead of being stored on the state.
+    """
+
+    _instances = {}
+
+    def __new__(cls):
+        instance = ApplicationState._instances.get(cls)
+        if instance is None:
+            instance = super().__new__(cls)
+            ApplicationState._instances[cls] = instance
+        return instance
+
+    def accept(self, context):
         raise InvalidTransitionError(
             f"Cannot accept from {self.__class__.__name__}"
         )
 
-    def reject(self):
+    def reject(self, context):
         raise InvalidTransitionError(
             f"Cannot reject from {self.__class__.__name__}"
         )
 
-    def shortlist(self):
+    def shortlist(self, context):
         raise InvalidTransitionError(
             f"Cannot shortlist from {self.__class__.__name__}"
         )
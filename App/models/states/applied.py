@@ -4,8 +4,9 @@ from App.models.application_status import ApplicationStatus
 
 class AppliedState(ApplicationState):
 
+    @property
     def status_value(self):
         return ApplicationStatus.APPLIED
 
-    def shortlist(self):
-        self.context.changeState(ShortlistedState())
\ No newline at end of file
+    def shortlist(self, context):
+        context.changeState(ShortlistedState())
@@ -10,8 +10,8 @@ class ShortlistedState(ApplicationState):
     def status_value(self):
         return ApplicationStatus.SHORTLISTED
 
-    def accept(self):
-        self.context.changeState(AcceptedState())
+    def accept(self, context):
+        context.changeState(AcceptedState())
 
-    def reject(self):
-        self.context.changeState(RejectedState())
+    def reject(self, context):
+        context.changeState(RejectedState())
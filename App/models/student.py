@@ -16,8 +16,9 @@ class Student(db.Model):
     gpa = db.Column(db.Float)
     resume = db.Column(db.String(256))
 
-    def __init__(self, username, user_id,gpa=None,degree=None):
+    def __init__(self, username, user_id,gpa=None,degree=None,email=None):
         self.username = username
         self.user_id = user_id
         self.gpa=gpa
         self.degree=degree
+        self.email=email
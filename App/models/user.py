@@ -12,9 +12,13 @@ class User(db.Model):
     employer = db.relationship('Employer', backref='user', uselist=False)
     staff = db.relationship('Staff', backref='user', uselist=False)
     
-    def __init__(self, username, password, role):
+    def __init__(self, username, password, role, password_hash=None):
         self.username = username
-        self.set_password(password)
+        if password_hash is not None:
+            # Already hashed by the caller (e.g. off the event loop)
+            self.password = password_hash
+        else:
+            self.set_password(password)
         self.role = role
 
     def get_json(self):
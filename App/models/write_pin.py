@@ -0,0 +1,68 @@
+# App/models/write_pin.py
+#
+# When each user last committed a write, kept on the primary so every
+# worker sees it: a user who wrote within REPLICA_PIN_SECONDS reads from
+# the primary (App/replica.py), whichever worker serves the read. The row
+# is upserted in the writing transaction itself, so it is visible exactly
+# when the write is.
+from datetime import datetime
+
+from flask import g, has_request_context
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from App.database import db
+from App.replica import RoutingSession
+
+__all__ = ["WritePin", "last_write"]
+
+
+class WritePin(db.Model):
+    __tablename__ = 'write_pin'
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    written_at = db.Column(db.DateTime, nullable=False)
+
+
+def _pin_writer(session, connection):
+    # Only requests that route reads (REPLICA_DATABASE_URI set) and
+    # carry a verified JWT have a user to pin; once per transaction
+    if not has_request_context() or session.info.get('write_pinned'):
+        return
+    user_id = g.get('replica_user_id')
+    if user_id is None:
+        return
+    insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    table = WritePin.__table__
+    now = datetime.utcnow()
+    connection.execute(
+        insert(table).values(user_id=user_id, written_at=now)
+        .on_conflict_do_update(index_elements=[table.c.user_id], set_={"written_at": now})
+    )
+    session.info['write_pinned'] = True
+
+
+def last_write(session, user_id):
+    """When user_id last committed a write, or None."""
+    return session.execute(
+        select(WritePin.written_at).where(WritePin.user_id == user_id)
+    ).scalar()
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _pin_after_flush(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        _pin_writer(session, session.connection())
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _pin_on_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        session = orm_execute_state.session
+        _pin_writer(session, session.connection(bind_arguments={"clause": orm_execute_state.statement}))
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+@event.listens_for(RoutingSession, 'after_rollback')
+def _reset_pinned(session):
+    session.info.pop('write_pinned', None)
@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND = "replica"
+DEFAULT_PIN_SECONDS = 5.0
+SAFE_METHODS = ("GET", "HEAD")
+
+
+def replica_reads(view):
+    """
+    Mark a view as read-only, so its GET requests may be served from the
+    read replica. Goes below @route and above @jwt_required().
+    """
+    view.replica_reads = True
+    return view
+
+
+def reading_replica():
+    return has_request_context() and g.get("read_replica", False)
+
+
+@contextmanager
+def use_primary():
+    """Send the block's statements to the primary, e.g. to re-check a miss."""
+    routed = reading_replica()
+    if routed:
+        g.read_replica = False
+    try:
+        yield
+    finally:
+        if routed:
+            g.read_replica = True
+
+
+class RoutingSession(Session):
+    """
+    db.session class. While the current request reads from the replica,
+    queries go to the replica engine; flushes, DML statements and
+    everything after the transaction's first write stay on the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and reading_replica():
+            if self._flushing or getattr(clause, "is_dml", False):
+                self.info["wrote_primary"] = True
+            elif not self.info.get("wrote_primary"):
+                engine = self._db.engines.get(REPLICA_BIND)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _flushed(session, flush_context):
+    session.info["wrote_primary"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _executed(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote_primary"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_rollback")
+def _ended(session):
+    session.info.pop("wrote_primary", None)
+
+
+def configure_replica(app):
+    """
+    Opt-in: REPLICA_DATABASE_URI adds a "replica" bind that GET requests to
+    @replica_reads views read from. A user who committed a write reads
+    from the primary for the next REPLICA_PIN_SECONDS (5 by default), so
+    they always read their own writes; the pin is a write_pin row on the
+    primary (App/models/write_pin.py), so it holds on every worker. Call
+    before db.init_app(app).
+    """
+    uri = app.config.get("REPLICA_DATABASE_URI")
+    if not uri:
+        return False
+    app.config["SQLALCHEMY_BINDS"] = dict(app.config.get("SQLALCHEMY_BINDS") or {}, **{REPLICA_BIND: uri})
+    app.extensions["replica_pin_seconds"] = float(app.config.get("REPLICA_PIN_SECONDS", DEFAULT_PIN_SECONDS))
+
+    @app.before_request
+    def route_reads():
+        view = current_app.view_functions.get(request.endpoint)
+        g.read_replica = request.method in SAFE_METHODS and getattr(view, "replica_reads", False)
+
+    @app.teardown_request
+    def stop_routing(error=None):
+        # g outlives the request when an app context was already pushed
+        g.pop("read_replica", None)
+        g.pop("replica_user_id", None)
+
+    return True
@@ -0,0 +1,248 @@
+import atexit
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:\?|%\(\w+\)s|%s)(?:, ?(?:\?|%\(\w+\)s|%s))*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\([^()]*\))(?:, ?\([^()]*\))+")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+")
+_SPACE = re.compile(r"\s+")
+
+# Modules whose frames never count as the caller of a statement
+_SKIP_MODULES = ("App.slow_queries", "App.metrics", "App.database")
+_PREFERRED_MODULES = ("App.controllers.", "App.views.")
+
+
+def fingerprint(statement):
+    """
+    Normalize a statement so that executions differing only in literals,
+    parameter style, IN-list length or VALUES row count share one key.
+    Returns (fingerprint_id, normalized_sql).
+    """
+    normalized = _STRING.sub("?", statement)
+    normalized = _PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    normalized = _VALUES_ROWS.sub(r"\1, ...", normalized)
+    normalized = _SPACE.sub(" ", normalized).strip()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12], normalized
+
+
+def write_json_atomic(path, data):
+    """
+    Replace path with data as JSON. Each call writes its own uniquely
+    named temp file in the same directory, so threads or greenlets of one
+    worker flushing at once never write into each other's file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".flush-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def call_site(depth=2):
+    """
+    Innermost controller or view function on the stack, as
+    "controllers.application.decide"; the innermost other App frame
+    otherwise, or "unknown".
+    """
+    fallback = None
+    frame = sys._getframe(depth)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("App.") and not module.startswith(_SKIP_MODULES):
+            site = f"{module[4:]}.{frame.f_code.co_name}"
+            if module.startswith(_PREFERRED_MODULES):
+                return site
+            fallback = fallback or site
+        frame = frame.f_back
+    return fallback or "unknown"
+
+
+class SlowQueryLog:
+    """
+    Records statements slower than threshold_ms, aggregated by fingerprint.
+
+    Timing is two clock reads per statement; the stack walk and
+    fingerprinting only happen for slow ones. At most max_fingerprints
+    aggregates are kept; when full, the one with the least total time is
+    dropped. With a directory, each process flushes its aggregates to
+    directory/slow-queries-<pid>.json (at request teardown, at most every
+    flush_interval seconds, and at exit) so the CLI and any worker can
+    report across processes. Recording never touches the file.
+    """
+
+    def __init__(self, threshold_ms=100.0, max_fingerprints=500, directory=None, flush_interval=5.0):
+        self.threshold = threshold_ms / 1000.0
+        self.max_fingerprints = max_fingerprints
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flushed_at = 0.0
+
+    def attach(self, engine):
+        event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self.after_cursor_execute)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["slow_query_started"] = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed >= self.threshold:
+            self.record(statement, elapsed * 1000.0, call_site())
+
+    def record(self, statement, elapsed_ms, site):
+        key, normalized = fingerprint(statement)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    smallest = min(self._entries, key=lambda k: self._entries[k]["total_ms"])
+                    del self._entries[smallest]
+                entry = self._entries[key] = {
+                    "fingerprint": key, "statement": normalized,
+                    "count": 0, "total_ms": 0.0, "max_ms": 0.0, "call_sites": {},
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["call_sites"][site] = entry["call_sites"].get(site, 0) + 1
+            self._dirty = True
+
+    def entries(self):
+        with self._lock:
+            return [dict(entry, call_sites=dict(entry["call_sites"])) for entry in self._entries.values()]
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+        self.flush()
+
+    # ---- cross-process ----
+
+    def _path(self):
+        return os.path.join(self.directory, f"slow-queries-{os.getpid()}.json")
+
+    def flush(self):
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._dirty = False
+        self._flushed_at = time.monotonic()
+        write_json_atomic(self._path(), self.entries())
+
+    def flush_pending(self):
+        if self._dirty:
+            self.flush()
+
+    def maybe_flush(self):
+        if self.directory and self._dirty and time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def teardown_request(self, exc=None):
+        self.maybe_flush()
+
+    def collect(self):
+        """This process's aggregates plus every other process's last flush."""
+        sources = [self.entries()]
+        if self.directory:
+            own = self._path()
+            for path in glob.glob(os.path.join(self.directory, "slow-queries-*.json")):
+                if path == own:
+                    continue
+                try:
+                    with open(path) as f:
+                        sources.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return merge_entries(sources)
+
+    def clear_all(self):
+        """Reset this process and delete every flushed file."""
+        self.reset()
+        if self.directory:
+            for path in glob.glob(os.path.join(self.directory, "slow-queries-*.json")):
+                os.remove(path)
+
+
+def merge_entries(sources):
+    merged = {}
+    for entries in sources:
+        for entry in entries:
+            target = merged.get(entry["fingerprint"])
+            if target is None:
+                merged[entry["fingerprint"]] = dict(entry, call_sites=dict(entry["call_sites"]))
+                continue
+            target["count"] += entry["count"]
+            target["total_ms"] += entry["total_ms"]
+            target["max_ms"] = max(target["max_ms"], entry["max_ms"])
+            for site, count in entry["call_sites"].items():
+                target["call_sites"][site] = target["call_sites"].get(site, 0) + count
+    return list(merged.values())
+
+
+SORT_KEYS = ("total_ms", "max_ms", "count")
+
+
+def top_slow_queries(entries, limit=20, sort="total_ms"):
+    """Top aggregates by sort key, with mean time and call sites busiest first."""
+    ranked = sorted(entries, key=lambda e: e[sort], reverse=True)[:limit]
+    return [
+        dict(
+            entry,
+            mean_ms=entry["total_ms"] / entry["count"],
+            call_sites=dict(sorted(entry["call_sites"].items(), key=lambda item: -item[1])),
+        )
+        for entry in ranked
+    ]
+
+
+def setup_slow_query_log(app, engines):
+    """
+    Opt-in: SLOW_QUERY_MS enables recording on the given engines
+    (SLOW_QUERY_MAX_FINGERPRINTS, SLOW_QUERY_DIR tune it).
+    """
+    threshold = app.config.get("SLOW_QUERY_MS")
+    if not threshold:
+        return None
+    log = SlowQueryLog(
+        threshold_ms=float(threshold),
+        max_fingerprints=app.config.get("SLOW_QUERY_MAX_FINGERPRINTS", 500),
+        directory=app.config.get("SLOW_QUERY_DIR"),
+    )
+    for engine in engines:
+        log.attach(engine)
+    if log.directory:
+        app.teardown_request(log.teardown_request)
+        atexit.register(log.flush_pending)
+    app.extensions["slow_query_log"] = log
+    return log
+
+
+def get_slow_query_log():
+    return current_app.extensions.get("slow_query_log")
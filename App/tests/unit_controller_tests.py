@@ -1,8 +1,13 @@
 import pytest
-from App.controllers.application import apply, shortlist, decide, get_status
+from App.controllers.application import apply, shortlist, decide, get_status, DuplicateApplicationError, PositionFullError
 from App.controllers.position import open_position, get_positions_by_employer_json
 from App.models import Position
-from App.controllers.user import create_user
+from App.controllers.user import create_user, update_user
+from App.controllers.principal import PrincipalCache, load_principal, get_principal_cache
+from App.controllers.password import PasswordHasher, PasswordHasherBusy
+from App.controllers.auth import login
+from App.controllers.serializers import application_page, position_list
+from App.json_provider import OrjsonProvider
 from App.models.states.application_state import InvalidTransitionError
 from App import create_app
 from App.database import db
@@ -57,15 +62,15 @@ def test_apply_state_starts_at_applied(empty_db):
     assert get_status(application.id) == "APPLIED"
 
 
-def test_apply_multiple_applications_same_student(empty_db):
-    """Test that a student can create multiple applications."""
+def test_apply_second_application_same_student_raises(empty_db):
+    """Test that a student can only hold one application."""
     student_user = create_user("Deon", "student_pass123", "student")
     first_application = apply(student_user.user_id)
-    second_application = apply(student_user.user_id)
    
-    assert first_application.id != second_application.id
+    with pytest.raises(DuplicateApplicationError):
+        apply(student_user.user_id)
+   
     assert first_application.student_id == student_user.id
-    assert second_application.student_id == student_user.id
 
 
 # ==============================================================================
@@ -244,6 +249,27 @@ def test_decide_accept_decrements_position_count(empty_db):
     assert updated_position.number == initial_positions - 1
 
 
+def test_decide_accept_on_full_position_raises_and_rolls_back(empty_db):
+    """Test that accepting into a full position is refused without side effects."""
+    first_student = create_user("Keron", "student_pass123", "student")
+    second_student = create_user("Ria", "student_pass123", "student")
+    staff_user = create_user("Sade", "staff_pass123", "staff")
+    employer_user = create_user("Kwesi", "employer_pass123", "employer")
+   
+    position = open_position("Site Reliability Engineer", employer_user.user_id, 1)
+    first_application = apply(first_student.user_id)
+    second_application = apply(second_student.user_id)
+    shortlist(staff_user.user_id, first_application.id, position.id)
+    shortlist(staff_user.user_id, second_application.id, position.id)
+    decide(employer_user.user_id, first_application.id, "ACCEPTED")
+   
+    with pytest.raises(PositionFullError):
+        decide(employer_user.user_id, second_application.id, "ACCEPTED")
+   
+    assert get_status(second_application.id) == "SHORTLISTED"
+    assert Position.query.get(position.id).number == 0
+
+
 def test_decide_reject_does_not_decrement_position_count(empty_db):
     """Test that Reject doesn't decrement position count."""
     student_user = create_user("Ria", "student_pass123", "student")
@@ -433,4 +459,130 @@ def test_open_position_multiple_positions_different_employers(empty_db):
     assert len(first_employer_positions) == 1
     assert len(second_employer_positions) == 1
     assert first_employer_positions[0]['title'] == "Tech Company Position"
-    assert second_employer_positions[0]['title'] == "Finance Company Position"
\ No newline at end of file
+    assert second_employer_positions[0]['title'] == "Finance Company Position"
+
+# ==============================================================================
+# 12. Principal Cache Tests
+# ==============================================================================
+
+def test_principal_cache_evicts_least_recently_used():
+    """Test that the cache stays within maxsize, evicting the coldest entry."""
+    cache = PrincipalCache(maxsize=2, ttl=60)
+    cache.put(1, "one")
+    cache.put(2, "two")
+    cache.get(1)
+    cache.put(3, "three")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "one"
+    assert cache.get(3) == "three"
+
+
+def test_principal_cache_expires_entries_after_ttl():
+    """Test that entries older than the TTL are treated as misses."""
+    now = [0.0]
+    cache = PrincipalCache(maxsize=10, ttl=5, clock=lambda: now[0])
+    cache.put(1, "one")
+    assert cache.get(1) == "one"
+
+    now[0] = 6.0
+    assert cache.get(1) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_load_principal_resolves_role_ids(empty_db):
+    """Test that a principal carries the linked role row id."""
+    staff_user = create_user("Jelani", "staff_pass123", "staff")
+    principal = load_principal(staff_user.user_id)
+
+    assert principal.role == "staff"
+    assert principal.staff_id == staff_user.id
+    assert principal.student_id is None
+    assert principal.employer_id is None
+
+
+def test_update_user_invalidates_cached_principal(empty_db):
+    """Test that update_user drops the stale cached principal."""
+    student_user = create_user("Keron", "student_pass123", "student")
+    assert load_principal(student_user.user_id).username == "Keron"
+
+    update_user(student_user.user_id, "KeronB")
+
+    assert load_principal(student_user.user_id).username == "KeronB"
+    assert get_principal_cache().stats()["misses"] == 2
+
+
+# ==============================================================================
+# 13. Password Hasher Tests
+# ==============================================================================
+
+def test_password_hasher_round_trip_records_timings():
+    """Test that pooled hashing verifies and records wait/hash timings."""
+    hasher = PasswordHasher(workers=1, queue_size=4)
+    pwhash = hasher.hash("secret")
+
+    assert hasher.verify(pwhash, "secret") is True
+    assert hasher.verify(pwhash, "wrong") is False
+
+    stats = hasher.stats()
+    assert stats["calls"] == 3
+    assert stats["hash_time_max"] > 0
+
+
+def test_password_hasher_full_queue_raises_busy():
+    """Test that callers are refused once every slot is taken."""
+    hasher = PasswordHasher(workers=1, queue_size=0, timeout=0.01)
+    hasher._slots.acquire()
+
+    with pytest.raises(PasswordHasherBusy):
+        hasher.hash("secret")
+
+
+def test_login_verifies_password_on_pool(empty_db):
+    """Test that login still accepts the right password and refuses a wrong one."""
+    create_user("Sade", "staff_pass123", "staff")
+
+    assert login("Sade", "staff_pass123") is not None
+    assert login("Sade", "wrong_pass") is None
+
+
+# ==============================================================================
+# 14. Serializer Tests
+# ==============================================================================
+
+def test_application_page_projects_first_shortlisted_position(empty_db):
+    """Test that projected pages match the ORM serialization, position included."""
+    staff_user = create_user("Sade", "staff_pass123", "staff")
+    employer_user = create_user("Marlon", "employer_pass123", "employer")
+    position = open_position("Cloud Engineer", employer_user.user_id, 2)
+    applied = apply(create_user("Keron", "student_pass123", "student").user_id)
+    shortlisted = apply(create_user("Ria", "student_pass123", "student").user_id)
+    shortlist(staff_user.user_id, shortlisted.id, position.id)
+
+    items, next_cursor = application_page(limit=1, with_positions=True)
+    rest, last_cursor = application_page(limit=1, after=next_cursor, with_positions=True)
+
+    assert items == [{"application_id": applied.id, "student_id": applied.student_id, "status": "APPLIED"}]
+    assert rest == [{
+        "application_id": shortlisted.id, "student_id": shortlisted.student_id, "status": "SHORTLISTED",
+        "position": {"position_id": position.id, "title": "Cloud Engineer"},
+    }]
+    assert last_cursor is None
+    assert position_list(position.employer_id) == [{
+        "position_id": position.id, "title": "Cloud Engineer", "number_of_positions": 2,
+        "employer_id": position.employer_id,
+    }]
+
+
+def test_json_provider_is_pluggable():
+    """Test that orjson is the default provider and JSON_PROVIDER=std falls back to the stdlib."""
+    fast = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    std = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'JSON_PROVIDER': 'std'})
+
+    assert isinstance(fast.json, OrjsonProvider)
+    assert not isinstance(std.json, OrjsonProvider)
+    with fast.test_request_context():
+        response = fast.json.response({1: "a", "b": [1.5, None]})
+    assert fast.json.loads(response.get_data()) == {"1": "a", "b": [1.5, None]}
+    assert response.mimetype == "application/json"
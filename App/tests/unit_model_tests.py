@@ -1,4 +1,6 @@
 import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
 
 from App.main import create_app
 from App.database import db, create_db
@@ -7,9 +9,10 @@ from App.models.student import Student
 from App.models.position import Position, PositionStatus
 from App.models.employer import Employer
 from App.models.application import Application
+from App.models.application_event import ApplicationEvent
 from App.models.application_status import ApplicationStatus
 from App.models.shortlist import Shortlist, DecisionStatus
-from App.models.states import InvalidTransitionError
+from App.models.states import InvalidTransitionError, ShortlistedState
 from App.controllers.user import create_user, get_user_by_username
 from App.controllers.student import create_student, add_gpa_to_student, add_degree_to_student
 from App.controllers.position import open_position, get_all_positions_json, get_positions_by_employer
@@ -297,3 +300,105 @@ def test_state_transitions_maintain_consistency(empty_db):
     assert app1.status == ApplicationStatus.ACCEPTED
     assert app2.status == ApplicationStatus.REJECTED
     assert app3.status == ApplicationStatus.SHORTLISTED
+
+
+def test_state_objects_are_shared_flyweights(empty_db):
+    app1 = Application(student_id=1)
+    app2 = Application(student_id=2)
+
+    app1.shortlist()
+    app2.shortlist()
+
+    assert app1._state is app2._state
+    assert app1._state is ShortlistedState()
+    assert "_state" not in vars(app1)
+
+
+def test_loaded_application_resumes_from_stored_status(empty_db):
+    student = create_user("nia", "p", "student")
+    app_obj = Application(student_id=student.id, status=ApplicationStatus.SHORTLISTED)
+    db.session.add(app_obj)
+    db.session.commit()
+    app_id = app_obj.id
+    db.session.expunge_all()
+
+    loaded = db.session.get(Application, app_id)
+    loaded.reject()
+    assert loaded.status == ApplicationStatus.REJECTED
+
+    with pytest.raises(InvalidTransitionError):
+        loaded.accept()
+
+
+def test_transitions_append_application_events(empty_db):
+    """Test that each transition is logged with its actor and the log cannot be edited."""
+    student = create_user("Keron", "student_pass123", "student")
+    staff = create_user("Sade", "staff_pass123", "staff")
+    app = Application(student_id=student.id)
+    db.session.add(app)
+    db.session.commit()
+
+    app.shortlist(staff.user_id)
+    app.reject()
+    db.session.commit()
+
+    events = ApplicationEvent.query.filter_by(application_id=app.id).order_by(ApplicationEvent.id).all()
+    assert [(e.from_status, e.to_status, e.actor_user_id) for e in events] == [
+        (ApplicationStatus.APPLIED, ApplicationStatus.SHORTLISTED, staff.user_id),
+        (ApplicationStatus.SHORTLISTED, ApplicationStatus.REJECTED, None),
+    ]
+
+    events[0].actor_user_id = None
+    with pytest.raises(ValueError):
+        db.session.commit()
+
+
+def test_transition_events_follow_the_owning_session(empty_db):
+    """Test that an event is queued on the session holding the application, and skipped for a transient one."""
+    student = create_user("Keron", "student_pass123", "student")
+    app = Application(student_id=student.id)
+    db.session.add(app)
+    db.session.commit()
+    app_id = app.id
+
+    other = Session(db.engine)
+    try:
+        loaded = other.get(Application, app_id)
+        loaded.shortlist()
+        assert "pending_events" not in db.session.info
+        other.commit()
+    finally:
+        other.close()
+    assert [e.to_status for e in ApplicationEvent.query.filter_by(application_id=app_id)] == [
+        ApplicationStatus.SHORTLISTED
+    ]
+
+    transient = Application(student_id=student.id)
+    transient.shortlist()
+    assert transient.status == ApplicationStatus.SHORTLISTED
+    assert "pending_events" not in db.session.info
+
+
+# =============================================================================
+# QUERY PLAN TESTS
+# =============================================================================
+
+def query_plan(query):
+    sql = str(query.statement.compile(db.engine, compile_kwargs={"literal_binds": True}))
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return " ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize("build_query, index_name", [
+    (lambda: Application.query.filter_by(student_id=1), "ix_application_student_id"),
+    (lambda: Application.query.filter_by(status=ApplicationStatus.APPLIED), "ix_application_status"),
+    (lambda: Shortlist.query.filter_by(application_id=1), "ix_shortlist_application_id"),
+    (lambda: Shortlist.query.filter_by(position_id=1), "ix_shortlist_position_id_status"),
+    (lambda: Shortlist.query.filter_by(position_id=1, status=DecisionStatus.PENDING), "ix_shortlist_position_id_status"),
+    (lambda: Position.query.filter_by(employer_id=1), "ix_position_employer_id"),
+    (lambda: Position.query.filter_by(status=PositionStatus.open), "ix_position_status"),
+    (lambda: ApplicationEvent.query.filter_by(application_id=1).order_by(ApplicationEvent.created_at),
+     "ix_application_event_application_id_created_at"),
+])
+def test_hot_queries_use_indexes(empty_db, build_query, index_name):
+    assert index_name in query_plan(build_query())
@@ -6,6 +6,7 @@ from .applications_api import api
 from .application_extras_api import application_extras_api
 from .application_extras_api import application_extras_api
 from .application_extras_api import openings_extras_api
+from .metrics import metrics_views
 
-views = [user_views, index_views, auth_views, applications_api, application_extras_api, openings_extras_api, api] 
+views = [user_views, index_views, auth_views, applications_api, application_extras_api, openings_extras_api, api, metrics_views] 
 # blueprints must be added to this list
\ No newline at end of file
@@ -2,10 +2,26 @@ from flask import Blueprint, jsonify, request
 from App.models.employer import Employer
 from flask_jwt_extended import jwt_required, current_user
 
+from App.database import db
 from App.models import Application, Student, Shortlist
 from App.models.application_status import ApplicationStatus
+from App.models.states import InvalidTransitionError
 from App.models.position import Position
 from App.models.staff import Staff
+from App.controllers.application import (
+    with_shortlist_positions,
+    get_application_history,
+    bulk_decide,
+    PositionFullError,
+    MAX_BULK_ITEMS,
+)
+from App.controllers.ranking import get_top_candidates, DEFAULT_TOP_K, MAX_TOP_K
+from App.controllers.serializers import application_page, position_list
+from App.controllers.stats import get_position_stats
+from App.controllers.versions import positions_etag
+from App.views.pagination import page_args, status_arg, application_filters, page_response
+from App.views.conditional import conditional_response
+from App.replica import replica_reads
 
 # Extra endpoints for applications
 application_extras_api = Blueprint(
@@ -26,6 +42,10 @@ def _serialize_application(application):
     """
     Serialize an Application similar to your /api/applications/<id> endpoint.
     Adds position info when SHORTLISTED / ACCEPTED / REJECTED.
+
+    Reads application.shortlists rather than querying per row, so callers
+    serializing many applications should eager-load them with
+    with_shortlist_positions().
     """
     data = {
         "application_id": application.id,
@@ -37,7 +57,7 @@ def _serialize_application(application):
         return data
 
     # For SHORTLISTED / ACCEPTED / REJECTED, attach position info (via Shortlist)
-    shortlist_entry = Shortlist.query.filter_by(application_id=application.id).first()
+    shortlist_entry = min(application.shortlists, key=lambda s: s.id, default=None)
     if shortlist_entry and shortlist_entry.position:
         position = shortlist_entry.position
         data["position"] = {
@@ -51,6 +71,7 @@ def _serialize_application(application):
 # ===================== APPLICATION EXTRAS =====================
 
 @application_extras_api.route("/my", methods=["GET"])
+@replica_reads
 @jwt_required()
 def get_my_application():
     """
@@ -61,19 +82,41 @@ def get_my_application():
     curr = current_user
 
     # Ensure user is a student
-    student = Student.query.filter_by(user_id=curr.id).first()
-    if not student:
+    if not curr.student_id:
         return jsonify({"message": "Only students can access their application"}), 403
 
     # One application per student
-    application = Application.query.filter_by(student_id=student.id).first()
+    application = with_shortlist_positions(Application.query).filter_by(student_id=curr.student_id).first()
     if not application:
         return jsonify({"message": "No application found for this student"}), 404
 
     return jsonify(_serialize_application(application)), 200
 
 
+@application_extras_api.route("/<int:application_id>/history", methods=["GET"])
+@jwt_required()
+def get_application_history_view(application_id):
+    """
+    GET /api/applications/<application_id>/history
+    - Students can only view their own application's history
+    - Returns every state transition, oldest first, with the acting user
+    """
+    curr = current_user
+
+    student_id = db.session.query(Application.student_id).filter_by(id=application_id).scalar()
+    if student_id is None:
+        return jsonify({"message": "Application not found"}), 404
+    if curr.role == "student" and student_id != curr.student_id:
+        return jsonify({"message": "You can only view the history of your own application"}), 403
+
+    return jsonify({
+        "application_id": application_id,
+        "events": get_application_history(application_id),
+    }), 200
+
+
 @application_extras_api.route("/status/<string:status_name>", methods=["GET"])
+@replica_reads
 @jwt_required()
 def get_applications_by_status(status_name):
     """
@@ -83,28 +126,29 @@ def get_applications_by_status(status_name):
     """
     curr = current_user
 
-    # Check staff via Staff model (consistent with your shortlist endpoint)
-    staff = Staff.query.filter_by(user_id=curr.id).first()
-    if not staff:
+    # Staff row id comes with the cached principal (consistent with your shortlist endpoint)
+    if not curr.staff_id:
         return jsonify({"message": "Only staff can filter applications by status"}), 403
 
     # Normalize and validate status
-    status_key = status_name.upper()
-    try:
-        status_enum = ApplicationStatus[status_key]
-    except KeyError:
+    status_enum = status_arg(status_name)
+    if status_enum is None:
         return jsonify({
             "message": "Invalid status. Use one of: APPLIED, SHORTLISTED, ACCEPTED, REJECTED"
         }), 400
 
-    applications = Application.query.filter_by(status=status_enum).all()
-    serialized = [_serialize_application(app) for app in applications]
+    limit, after = page_args()
+    filters, _ = application_filters("student_id", "position_id")
+    serialized, next_cursor = application_page(
+        limit, after, status=status_enum, with_positions=True, **filters
+    )
 
-    return jsonify(serialized), 200
+    return jsonify(page_response(serialized, next_cursor)), 200
 
 
 # ===================== OPENINGS EXTRAS =====================
 @openings_extras_api.route("/my", methods=["GET"])
+@replica_reads
 @jwt_required()
 def get_my_openings():
     """
@@ -116,27 +160,23 @@ def get_my_openings():
 
     if curr.role != "employer":
         return jsonify({"message": "Only employers can view their openings"}), 403
-    employer = Employer.query.filter_by(user_id=curr.id).first()
-    if not employer:
+    if not curr.employer_id:
         return jsonify({"message": "Employer record not found for this user"}), 404
 
-    # Now filter positions by employer.id (NOT user id)
-    positions = Position.query.filter_by(employer_id=employer.id).all()
+    return conditional_response(
+        positions_etag(curr.employer_id),
+        lambda: _my_openings_response(curr.employer_id)
+    )
 
-    positions_list = []
-    for pos in positions:
-        positions_list.append({
-            "position_id": pos.id,
-            "title": pos.title,
-            "number_of_positions": pos.number_of_positions,
-            "employer_id": pos.employer_id
-        })
 
-    return jsonify(positions_list), 200
+def _my_openings_response(employer_id):
+    # Now filter positions by employer.id (NOT user id)
+    return jsonify(position_list(employer_id)), 200
 
 
 
 @openings_extras_api.route("/<int:position_id>/applications", methods=["GET"])
+@replica_reads
 @jwt_required()
 def get_applications_for_opening(position_id):
     """
@@ -149,9 +189,8 @@ def get_applications_for_opening(position_id):
     if curr.role != "employer":
         return jsonify({"message": "Only employers can view applications for an opening"}), 403
 
-    # Find the employer record linked to this user
-    employer = Employer.query.filter_by(user_id=curr.id).first()
-    if not employer:
+    # The employer record linked to this user comes with the principal
+    if not curr.employer_id:
         return jsonify({"message": "Employer record not found for this user"}), 404
 
     position = Position.query.get(position_id)
@@ -159,20 +198,109 @@ def get_applications_for_opening(position_id):
         return jsonify({"message": "Position not found"}), 404
 
     # Ensure the logged-in employer owns this position
-    if position.employer_id != employer.id:
+    if position.employer_id != curr.employer_id:
         return jsonify({"message": "You are not authorized to view applications for this opening"}), 403
 
-    # Get all shortlists for this position and collect applications
-    shortlists = Shortlist.query.filter_by(position_id=position.id).all()
+    limit, after = page_args()
+    filters, error = application_filters("status", "student_id")
+    if error:
+        return jsonify({"message": error}), 400
+
+    # Applications shortlisted to this position, one keyset page at a time
+    applications_list, next_cursor = application_page(limit, after, position_id=position.id, **filters)
+
+    return jsonify(page_response(applications_list, next_cursor)), 200
 
-    applications_list = []
-    for s in shortlists:
-        application = s.application  # assumes relationship on Shortlist -> Application
-        applications_list.append({
-            "application_id": application.id,
-            "student_id": application.student_id,
-            "status": application.status.name
-        })
 
-    return jsonify(applications_list), 200
 
+@openings_extras_api.route("/<int:position_id>/stats", methods=["GET"])
+@replica_reads
+@jwt_required()
+def get_opening_stats(position_id):
+    """
+    GET /api/openings/<position_id>/stats
+    - Staff, or the employer who owns this opening
+    - Returns shortlisted (pending) / accepted / rejected counts from the
+      position_stats counters
+    """
+    curr = current_user
+
+    if not curr.staff_id and not curr.employer_id:
+        return jsonify({"message": "Only staff and employers can view opening stats"}), 403
+
+    employer_id = db.session.query(Position.employer_id).filter_by(id=position_id).scalar()
+    if employer_id is None:
+        return jsonify({"message": "Position not found"}), 404
+    if not curr.staff_id and employer_id != curr.employer_id:
+        return jsonify({"message": "You are not authorized to view stats for this opening"}), 403
+
+    return jsonify({"position_id": position_id, **get_position_stats(position_id)}), 200
+
+
+@openings_extras_api.route("/<int:position_id>/candidates", methods=["GET"])
+@replica_reads
+@jwt_required()
+def get_candidates_for_opening(position_id):
+    """
+    GET /api/openings/<position_id>/candidates?k=50
+    - Only staff
+    - Returns the top-k APPLIED applications ranked for this opening by
+      GPA and degree match against the title (weights via gpa_weight /
+      degree_weight, defaulting to CANDIDATE_*_WEIGHT config)
+    """
+    curr = current_user
+
+    if not curr.staff_id:
+        return jsonify({"message": "Only staff can rank candidates"}), 403
+
+    k = request.args.get("k", DEFAULT_TOP_K, type=int)
+    k = max(1, min(k, MAX_TOP_K))
+    gpa_weight = request.args.get("gpa_weight", None, type=float)
+    degree_weight = request.args.get("degree_weight", None, type=float)
+
+    try:
+        candidates = get_top_candidates(position_id, k, gpa_weight, degree_weight)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 404
+
+    return jsonify(candidates), 200
+
+
+@openings_extras_api.route("/<int:position_id>/decisions", methods=["POST"])
+@jwt_required()
+def decide_applications_for_opening(position_id):
+    """
+    POST /api/openings/<position_id>/decisions
+    - Only the employer who owns this opening
+    - Body: {"decisions": {"<application_id>": "ACCEPTED" | "REJECTED", ...}}
+    - Applies every decision in one transaction and reports each outcome
+    """
+    curr = current_user
+
+    if curr.role != "employer":
+        return jsonify({"message": "Only employers can make decisions on applications"}), 403
+
+    data = request.json or {}
+    decisions = data.get("decisions")
+    if not isinstance(decisions, dict) or not decisions:
+        return jsonify({"message": "decisions must be a non-empty map of application id to decision"}), 400
+    if len(decisions) > MAX_BULK_ITEMS:
+        return jsonify({"message": f"At most {MAX_BULK_ITEMS} decisions per request"}), 400
+
+    pairs = []
+    for application_id, decision in decisions.items():
+        try:
+            pairs.append((int(application_id), decision))
+        except (TypeError, ValueError):
+            pairs.append((None, decision))
+
+    try:
+        outcome = bulk_decide(curr.id, position_id, pairs)
+    except PermissionError as e:
+        return jsonify({"message": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 404
+    except (PositionFullError, InvalidTransitionError) as e:
+        return jsonify({"message": str(e)}), 409
+
+    return jsonify(outcome), 200
@@ -1,16 +1,25 @@
 from flask import Blueprint, jsonify, request,flash
 from flask_jwt_extended import jwt_required, current_user
 from App.models import Application, Student, Shortlist
-from App.controllers.application import apply,decide,shortlist
+from App.controllers.application import apply,decide,shortlist,DuplicateApplicationError,PositionFullError,bulk_shortlist,MAX_BULK_ITEMS
 from App.models.application_status import ApplicationStatus
+from App.models.states import InvalidTransitionError
 from App.controllers.user import create_user
 from App.controllers.position import open_position
 from App.models.staff import Staff
 from App.models.employer import Employer
 from App.models.position import Position
-from App.controllers.student import add_degree_to_student, add_gpa_to_student
+from App.controllers.student import add_degree_to_student, add_gpa_to_student, update_student_profile, valid_email
 from flask_jwt_extended import jwt_required, current_user, unset_jwt_cookies, set_access_cookies
-from App.controllers import login
+from App.controllers import login, signup
+from App.views.pagination import page_args, application_filters, page_response
+from App.controllers.search import search, SEARCH_KINDS, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from App.controllers.serializers import application_page, position_list
+from App.controllers.stats import get_stats
+from App.controllers.versions import positions_etag, application_etag
+from App.views.conditional import conditional_response
+from App.replica import replica_reads
+from App.slow_queries import get_slow_query_log, top_slow_queries, SORT_KEYS
 
 
 applications_api = Blueprint('applications_api', __name__, url_prefix="/api/applications")
@@ -24,38 +33,38 @@ def ping():
 @applications_api.route("/student_apply", methods=['POST'])
 @jwt_required()
 def student_apply():
-    data = request.json
     curr = current_user
-    students = Student.query.all()
-    
-    applications = Application.query.all()
-    for app in applications:
-        if app.student.user_id == curr.id:
-            return jsonify({"message": f"Student with user id {app.student.user_id} has already sent in an application"}), 400
-    
-    for student in students:
-        if student.user_id == curr.id:
-            application = apply(curr.id)
-            return jsonify({"message": f"Application submitted successfully for student number {student.id}. Application status: Applied"}), 201
-    return jsonify({"message": "Only students can submit applications"}), 403
+    try:
+        application = apply(curr.id)
+    except PermissionError:
+        return jsonify({"message": "Only students can submit applications"}), 403
+    except DuplicateApplicationError as e:
+        return jsonify({"message": str(e)}), 409
+    return jsonify({"message": f"Application submitted successfully for student number {application.student_id}. Application status: Applied"}), 201
 
 
 @applications_api.route("/all_applications", methods=['GET'])
+@replica_reads
 @jwt_required()
 def get_applications():
-    applications = Application.query.all()
-    applications_list = []
-    for app in applications:
-        applications_list.append({
-            "application_id": app.id,
-            "student_id": app.student_id,
-            "status": app.status.name
-        })
-    return jsonify(applications_list), 200
+    limit, after = page_args()
+    filters, error = application_filters("status", "student_id", "position_id")
+    if error:
+        return jsonify({"message": error}), 400
+    applications_list, next_cursor = application_page(limit, after, **filters)
+    return jsonify(page_response(applications_list, next_cursor)), 200
 
 @applications_api.route("/<int:application_id>", methods=['GET'])
+@replica_reads
 @jwt_required()
 def get_application(application_id):
+    return conditional_response(
+        application_etag(application_id),
+        lambda: _application_response(application_id)
+    )
+
+
+def _application_response(application_id):
     application = Application.query.get(application_id)
     if not application:
         return jsonify({"message": "Application not found"}), 404
@@ -101,8 +110,7 @@ def get_application(application_id):
 def get_shortlist_info(application_id):
     
     curr = current_user
-    staff = Staff.query.filter_by(user_id=curr.id).first()
-    if not staff:
+    if not curr.staff_id:
         return jsonify({"message": "Only staff can shortlist applications"}), 403
     
     application = Application.query.get(application_id)
@@ -117,7 +125,10 @@ def get_shortlist_info(application_id):
     data = request.json
     position_id = data.get("position_id")
 
-    shortlist_entry = shortlist(curr.id, application_id, position_id)
+    try:
+        shortlist_entry = shortlist(curr.id, application_id, position_id)
+    except InvalidTransitionError as e:
+        return jsonify({"message": str(e)}), 409
 
     if not shortlist_entry:
         return jsonify({"message": "Failed to shortlist student"}), 400
@@ -126,6 +137,41 @@ def get_shortlist_info(application_id):
         "message": f"Student with user id {application.student.user_id} shortlisted successfully to shortlist {shortlist_entry.id}"
     }), 201
 
+def _is_id(value):
+    # JSON true/false arrive as bool, which is an int subclass; not ids
+    return isinstance(value, int) and not isinstance(value, bool)
+
+@applications_api.route("/shortlist:bulk", methods=['POST'])
+@jwt_required()
+def bulk_shortlist_applications():
+    curr = current_user
+    if not curr.staff_id:
+        return jsonify({"message": "Only staff can shortlist applications"}), 403
+
+    data = request.json or {}
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        return jsonify({"message": "items must be a non-empty list of {application_id, position_id}"}), 400
+    if len(items) > MAX_BULK_ITEMS:
+        return jsonify({"message": f"At most {MAX_BULK_ITEMS} items per request"}), 400
+
+    pairs = []
+    for item in items:
+        item = item if isinstance(item, dict) else {}
+        application_id = item.get("application_id")
+        position_id = item.get("position_id")
+        pairs.append((
+            application_id if _is_id(application_id) else None,
+            position_id if _is_id(position_id) else None,
+        ))
+
+    results = bulk_shortlist(curr.id, pairs)
+    return jsonify({
+        "results": results,
+        "shortlisted": sum(1 for r in results if r["status"] == "shortlisted"),
+        "refused": sum(1 for r in results if r["status"] == "refused"),
+    }), 200
+
 @applications_api.route("/<int:application_id>/decision", methods=['POST'])
 @jwt_required()
 def make_decision(application_id):
@@ -141,7 +187,10 @@ def make_decision(application_id):
     decision = data.get("decision")
     if decision not in ["ACCEPTED", "REJECTED"]:
         return jsonify({"message": "Decision must be either 'ACCEPTED' or 'REJECTED'"}), 400
-    application = decide(curr.id, application_id, decision)
+    try:
+        application = decide(curr.id, application_id, decision)
+    except (PositionFullError, InvalidTransitionError) as e:
+        return jsonify({"message": str(e)}), 409
     return jsonify({"message": f"Application {application_id} has been {decision.lower()}."}), 200
 
 @api.route("/signup", methods=['POST'])
@@ -156,32 +205,41 @@ def api_signup():
     if user_type not in ["student", "employer", "staff"]:
         return jsonify({"message": "Role must be either 'student', 'employer', or 'staff'"}), 400
     
+    gpa = degree = email = None
     if user_type == "student":
         gpa = data.get("gpa")
         degree = data.get("degree")
         if gpa is None or degree is None:
             return jsonify({"message": "GPA and degree are required for student signup"}), 400
-        status = create_user(username, password, user_type)
-        if not status:
-            return jsonify({"message": "Signup failed, username taken!"}), 401
-        else:
-            token = login(data['username'], data['password'])
-            flash('Signup Successful')
-            response = jsonify(access_token=token)
-            set_access_cookies(response, token) 
-            add_degree_to_student(status.id, degree)
-            add_gpa_to_student(status.id, gpa)
-            return response
-    
-    status = create_user(username, password, user_type)
-    if not status:
+        # Where decision notifications are sent; optional at signup
+        email = data.get("email")
+        if email is not None and not valid_email(email):
+            return jsonify({"message": "Invalid email address"}), 400
+
+    token = signup(username, password, user_type, degree=degree, gpa=gpa, email=email)
+    if not token:
         return jsonify({"message": "Signup failed, username taken!"}), 401
-    else:
-        token = login(data['username'], data['password'])
-        flash('Signup Successful')
-        response = jsonify(access_token=token)
-        set_access_cookies(response, token) 
-        return response
+    flash('Signup Successful')
+    response = jsonify(access_token=token)
+    set_access_cookies(response, token)
+    return response
+
+@api.route("/students/me", methods=['PATCH'])
+@jwt_required()
+def update_my_profile():
+    """Student updates their own email (for decision notifications), GPA or degree."""
+    if current_user.role != "student" or not current_user.student_id:
+        return jsonify({"message": "Only students have a profile to update"}), 403
+    data = request.get_json(silent=True) or {}
+    fields = {name: data[name] for name in ("email", "gpa", "degree") if name in data}
+    if not fields:
+        return jsonify({"message": "Provide email, gpa or degree"}), 400
+    if "email" in fields and fields["email"] is not None and not valid_email(fields["email"]):
+        return jsonify({"message": "Invalid email address"}), 400
+    student = update_student_profile(current_user.student_id, **fields)
+    if student is None:
+        return jsonify({"message": "Student record not found"}), 404
+    return jsonify({"email": student.email, "gpa": student.gpa, "degree": student.degree}), 200
 
 @api.route("/openings/<int:id>", methods=['POST'])
 @jwt_required()
@@ -201,15 +259,59 @@ def create_opening(id):
     return jsonify({"message": "Job opening created successfully", "opening_id": opening.id}), 201
 
 @api.route("/openings", methods=['GET'])
+@replica_reads
 @jwt_required()
 def list_openings():
-    positions = Position.query.all()
-    positions_list = []
-    for pos in positions:
-        positions_list.append({
-            "position_id": pos.id,
-            "title": pos.title,
-            "number_of_positions": pos.number_of_positions,
-            "employer_id": pos.employer_id
-        })
-    return jsonify(positions_list), 200
\ No newline at end of file
+    return conditional_response(positions_etag(), _openings_response)
+
+
+def _openings_response():
+    return jsonify(position_list()), 200
+
+@api.route("/stats", methods=['GET'])
+@replica_reads
+@jwt_required()
+def stats_api():
+    if not current_user.staff_id:
+        return jsonify({"message": "Only staff can view application stats"}), 403
+    return jsonify(get_stats()), 200
+
+@api.route("/admin/slow-queries", methods=['GET'])
+@jwt_required()
+def slow_queries_api():
+    if not current_user.staff_id:
+        return jsonify({"message": "Only staff can view the slow query log"}), 403
+    log = get_slow_query_log()
+    if log is None:
+        return jsonify({"message": "Slow query log is disabled (set SLOW_QUERY_MS)"}), 404
+    sort = request.args.get("sort", "total_ms")
+    if sort not in SORT_KEYS:
+        return jsonify({"message": f"sort must be one of {', '.join(SORT_KEYS)}"}), 400
+    limit = max(1, min(request.args.get("limit", 20, type=int), 500))
+    return jsonify({
+        "threshold_ms": log.threshold * 1000.0,
+        "queries": top_slow_queries(log.collect(), limit, sort),
+    }), 200
+
+@api.route("/search", methods=['GET'])
+@replica_reads
+@jwt_required()
+def search_api():
+    curr = current_user
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"message": "Query parameter q is required"}), 400
+
+    kinds = SEARCH_KINDS
+    if request.args.get("type") in SEARCH_KINDS:
+        kinds = (request.args["type"],)
+    # Student profiles are only searchable by staff and employers
+    if curr.role == "student":
+        kinds = tuple(k for k in kinds if k != "student")
+
+    limit = request.args.get("limit", DEFAULT_SEARCH_LIMIT, type=int)
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    page = max(1, request.args.get("page", 1, type=int))
+
+    results = search(q, kinds, limit, page)
+    return jsonify({"results": results, "page": page, "limit": limit}), 200
\ No newline at end of file
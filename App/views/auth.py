@@ -6,6 +6,7 @@ from.index import index_views
 
 from App.controllers import (
     login,
+    signup,
     create_user,
 )
 
@@ -39,12 +40,11 @@ def login_action():
 @auth_views.route('/signup', methods=['POST'])
 def signup_action():
     data = request.form
-    status = create_user(data['username'], data['password'], data['type'])
+    token = signup(data['username'], data['password'], data['type'])
     response = redirect(request.referrer)
-    if not status:
+    if not token:
         flash('Signup failed, username taken!'), 401
     else:
-        token = login(data['username'], data['password'])
         flash('Signup Successful')
         set_access_cookies(response, token)
     return response
@@ -0,0 +1,18 @@
+from flask import request, make_response
+
+
+def conditional_response(etag, build):
+    """
+    Answer 304 when the client's If-None-Match already has etag; otherwise
+    call build() for the full response. build only runs on a miss, so a
+    revalidation never loads ORM objects. A None etag skips the check.
+    """
+    if etag is not None and request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        response = make_response(build())
+    if etag is not None and response.status_code in (200, 304):
+        response.set_etag(etag)
+        # Cacheable, but clients must revalidate every time
+        response.headers["Cache-Control"] = "private, no-cache"
+    return response
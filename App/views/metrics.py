@@ -0,0 +1,25 @@
+import hmac
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+metrics_views = Blueprint('metrics_views', __name__)
+
+
+def _authorized():
+    """
+    /metrics is served only when METRICS_TOKEN is configured, to scrapers
+    sending it as "Authorization: Bearer <token>".
+    """
+    token = str(current_app.config.get("METRICS_TOKEN") or "")
+    scheme, _, sent = request.headers.get("Authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(sent.encode(), token.encode())
+
+
+@metrics_views.route('/metrics', methods=['GET'])
+def metrics_action():
+    metrics = current_app.extensions.get("metrics")
+    if metrics is None or not current_app.config.get("METRICS_TOKEN"):
+        return jsonify(message="Metrics are disabled"), 404
+    if not _authorized():
+        return jsonify(message="Metrics token required"), 401
+    return Response(metrics.collect(), content_type="text/plain; version=0.0.4; charset=utf-8")
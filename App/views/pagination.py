@@ -0,0 +1,45 @@
+from flask import request
+
+from App.controllers.application import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from App.models.application_status import ApplicationStatus
+
+
+def page_args():
+    """
+    Read the keyset pagination parameters from the query string.
+    limit is clamped to [1, MAX_PAGE_SIZE]; after is the last id already seen.
+    """
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    after = request.args.get("after", None, type=int)
+    return limit, after
+
+
+def status_arg(status_name):
+    """Map a status name to ApplicationStatus, or None when it is not valid."""
+    try:
+        return ApplicationStatus[status_name.upper()]
+    except KeyError:
+        return None
+
+
+def application_filters(*allowed):
+    """
+    Read optional application filters (status, student_id, position_id)
+    from the query string. Returns (filters, error_message).
+    """
+    filters = {}
+    if "status" in allowed and request.args.get("status"):
+        status = status_arg(request.args["status"])
+        if status is None:
+            return None, "Invalid status. Use one of: APPLIED, SHORTLISTED, ACCEPTED, REJECTED"
+        filters["status"] = status
+    if "student_id" in allowed:
+        filters["student_id"] = request.args.get("student_id", None, type=int)
+    if "position_id" in allowed:
+        filters["position_id"] = request.args.get("position_id", None, type=int)
+    return filters, None
+
+
+def page_response(items, next_cursor):
+    return {"applications": items, "next_cursor": next_cursor}
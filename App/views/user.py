@@ -6,9 +6,9 @@ from.index import index_views
 from App.controllers import (
     create_user,
     get_all_users,
-    get_all_users_json,
     jwt_required
 )
+from App.controllers.serializers import user_list
 
 user_views = Blueprint('user_views', __name__, template_folder='../templates')
 
@@ -26,8 +26,7 @@ def create_user_action():
 
 @user_views.route('/api/users', methods=['GET'])
 def get_users_action():
-    users = get_all_users_json()
-    return jsonify(users)
+    return jsonify(user_list())
 
 @user_views.route('/api/users', methods=['POST'])
 def create_user_endpoint():
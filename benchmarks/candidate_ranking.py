@@ -0,0 +1,97 @@
+"""
+Top-k candidate ranking benchmark.
+
+Bulk-loads N students with APPLIED applications and times
+get_top_candidates() (ORDER BY score LIMIT k in SQL) against loading every
+APPLIED application and sorting in Python.
+
+    python -m benchmarks.candidate_ranking --applications 500000 --k 50
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from App.main import create_app
+from App.database import db
+from App.models import Application, Student, Position
+from App.models.application_status import ApplicationStatus
+from App.controllers.ranking import get_top_candidates, title_keywords
+
+DEGREES = [
+    "Computer Science", "Software Engineering", "Database Management",
+    "Mechanical Engineering", "Design", "Information Technology", "Mathematics",
+]
+
+
+def seed(applications, batch=50000):
+    rng = random.Random(7)
+    db.session.execute(Position.__table__.insert(), [
+        {"id": 1, "title": "Database Engineer", "number_of_positions": 5, "status": "open", "employer_id": 1}
+    ])
+    for start in range(1, applications + 1, batch):
+        ids = range(start, min(start + batch, applications + 1))
+        db.session.execute(Student.__table__.insert(), [
+            {"id": i, "user_id": i, "username": f"s{i}",
+             "gpa": round(rng.uniform(2.0, 4.0), 2), "degree": rng.choice(DEGREES)}
+            for i in ids
+        ])
+        db.session.execute(Application.__table__.insert(), [
+            {"id": i, "student_id": i, "status": ApplicationStatus.APPLIED.name}
+            for i in ids
+        ])
+    db.session.commit()
+
+
+def python_sort(k):
+    keywords = title_keywords("Database Engineer")
+    rows = (
+        db.session.query(Application.id, Student.gpa, Student.degree)
+        .join(Student, Student.id == Application.student_id)
+        .filter(Application.status == ApplicationStatus.APPLIED)
+        .all()
+    )
+
+    def score(row):
+        degree = (row.degree or "").lower()
+        return (row.gpa or 0) + sum(w in degree for w in keywords) / len(keywords)
+
+    return sorted(rows, key=score, reverse=True)[:k]
+
+
+def timed(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--applications", type=int, default=500000)
+    parser.add_argument("--k", type=int, default=50)
+    args = parser.parse_args()
+
+    db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+    create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_file}",
+        # Synthetic rows reference parents that are never created
+        "SQLITE_PRAGMAS": {"foreign_keys": None},
+    })
+    db.create_all()
+    started = time.perf_counter()
+    seed(args.applications)
+    print(f"seeded {args.applications} applications in {time.perf_counter() - started:.1f} s")
+
+    sql_time = timed(lambda: get_top_candidates(1, args.k))
+    python_time = timed(lambda: python_sort(args.k))
+    print(f"SQL ORDER BY ... LIMIT {args.k}: {sql_time * 1000:>8.0f} ms")
+    print(f"load all + Python sort:   {python_time * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Concurrent write benchmark.
+
+Runs --workers processes of --threads threads each against one SQLite
+file, every thread taking its own students through apply, shortlist and
+decide, first with the driver defaults (rollback journal, no write retry)
+and then with the production profile (SQLITE_PRAGMAS on connect and
+retry_on_lock), reporting committed transactions per second, latency and
+the share of transactions that failed on lock contention.
+
+    python -m benchmarks.concurrent_writes --students 2000 --workers 8 --threads 8
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from App.main import create_app
+from App.database import db, is_lock_error
+from App.models import Student, Employer, Staff, Position
+from App.controllers.application import apply, shortlist, decide, PositionFullError
+from App.controllers.seed import seed
+
+MODES = {
+    "default": {"SQLITE_TUNING": False, "WRITE_RETRY_ATTEMPTS": 1},
+    "tuned": {},
+}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def prepare(db_file, overrides, students):
+    """Seed a fresh database file; returns the user ids each role acts as."""
+    app = create_app(dict(overrides, SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_file}"))
+    with app.app_context():
+        db.create_all()
+        seed(students=students, employers=10, positions=max(10, students // 20), staff=5)
+        actors = {
+            "students": [row.user_id for row in db.session.query(Student.user_id).order_by(Student.id)],
+            "staff": [row.user_id for row in db.session.query(Staff.user_id)],
+            "employers": [row.user_id for row in db.session.query(Employer.user_id)],
+            "positions": [row.id for row in db.session.query(Position.id)],
+        }
+        db.session.remove()
+        db.engine.dispose()
+    return actors
+
+
+def work(app, students, actors, stats, lock):
+    """One thread's share: apply, shortlist and decide for each student."""
+    committed = locked = failed = 0
+    latencies = []
+
+    def attempt(fn, *args):
+        nonlocal committed, locked, failed
+        started = time.perf_counter()
+        try:
+            result = fn(*args)
+        except PositionFullError:
+            result = True
+        except Exception as e:
+            db.session.rollback()
+            if is_lock_error(e):
+                locked += 1
+            else:
+                failed += 1
+            return None
+        latencies.append(time.perf_counter() - started)
+        committed += 1
+        return result
+
+    with app.app_context():
+        for i, user_id in enumerate(students):
+            application = attempt(apply, user_id)
+            if application is None:
+                continue
+            application_id = application.id
+            position_id = actors["positions"][i % len(actors["positions"])]
+            staff_id = actors["staff"][i % len(actors["staff"])]
+            if attempt(shortlist, staff_id, application_id, position_id) is None:
+                continue
+            employer_id = actors["employers"][i % len(actors["employers"])]
+            attempt(decide, employer_id, application_id, "ACCEPTED" if i % 10 == 0 else "REJECTED")
+        db.session.remove()
+    with lock:
+        stats["committed"] += committed
+        stats["locked"] += locked
+        stats["failed"] += failed
+        stats["latencies"].extend(latencies)
+
+
+def run_worker(db_file, overrides, students, actors, threads, barrier, results):
+    app = create_app(dict(overrides, SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_file}"))
+    stats = {"committed": 0, "locked": 0, "failed": 0, "latencies": []}
+    lock = threading.Lock()
+    pool = [
+        threading.Thread(target=work, args=(app, students[t::threads], actors, stats, lock))
+        for t in range(threads)
+    ]
+    barrier.wait()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put(stats)
+
+
+def run_mode(mode, students, workers, threads):
+    db_file = os.path.join(tempfile.mkdtemp(), f"{mode}.db")
+    overrides = MODES[mode]
+    actors = prepare(db_file, overrides, students)
+
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=run_worker, args=(
+            db_file, overrides, actors["students"][w::workers], actors, threads, barrier, results
+        ))
+        for w in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    started = time.perf_counter()
+    totals = {"committed": 0, "locked": 0, "failed": 0, "latencies": []}
+    for _ in processes:
+        stats = results.get()
+        for key in ("committed", "locked", "failed"):
+            totals[key] += stats[key]
+        totals["latencies"].extend(stats["latencies"])
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    attempted = totals["committed"] + totals["locked"] + totals["failed"]
+    return {
+        "mode": mode,
+        "committed": totals["committed"],
+        "locked": totals["locked"],
+        "failed": totals["failed"],
+        "tx_per_second": totals["committed"] / elapsed,
+        "error_rate": (totals["locked"] + totals["failed"]) / attempted if attempted else 0.0,
+        "p50_ms": percentile(totals["latencies"], 0.50) * 1000,
+        "p99_ms": percentile(totals["latencies"], 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'committed':>10} {'locked':>7} {'failed':>7} {'tx/s':>8} {'errors':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    results = {}
+    for mode in MODES:
+        r = results[mode] = run_mode(mode, args.students, args.workers, args.threads)
+        print(f"{mode:<8} {r['committed']:>10} {r['locked']:>7} {r['failed']:>7} {r['tx_per_second']:>8.1f} "
+              f"{r['error_rate']:>7.1%} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f}")
+    print(f"throughput: {results['tuned']['tx_per_second'] / results['default']['tx_per_second']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
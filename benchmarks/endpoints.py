@@ -0,0 +1,387 @@
+"""
+Endpoint benchmark suite with regression thresholds.
+
+Seeds a temporary SQLite database per scale with App.controllers.seed,
+drives every route of the applications, extras, openings, auth and user
+blueprints through the Flask test client, and records per route: latency
+percentiles, SQL statements per request and the peak Python allocation of
+one traced request. Results are written as JSON; `flask bench compare`
+(or compare() below) flags routes that got slower, heavier or chattier
+than a baseline.
+
+    python -m benchmarks.endpoints --scales 1k,100k,1m --requests 50 --output benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, func
+
+from App.main import create_app
+from App.database import db
+from App.models import Application, Employer, Position, Shortlist, Staff, Student
+from App.models.application_status import ApplicationStatus
+from App.models.shortlist import DecisionStatus
+from App.controllers.seed import seed, SEED_PASSWORD
+
+DEFAULT_SCALES = "1k,100k,1m"
+DEFAULT_REQUESTS = 50
+# Full-table listings are capped: one request at 1M rows takes seconds
+LISTING_REQUESTS = 5
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA_MS = 1.0
+MIN_DELTA_KIB = 64
+BULK_SIZE = 10
+
+# Routes that cannot succeed as written, so timing them measures nothing
+SKIPPED = {
+    "POST /users": "calls create_user without a role and always fails",
+    "POST /api/users": "calls create_user without a role and always fails",
+}
+
+
+def parse_scale(value):
+    value = value.strip().lower()
+    for suffix, factor in (("k", 1000), ("m", 1000000)):
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * factor)
+    return int(value)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class BenchContext:
+    """Seeded app plus the actors and targets the cases draw from."""
+
+    def __init__(self):
+        self._names = 0
+
+        # The employer with the most openings, and its busiest opening
+        self.employer_id, self.employer_user_id = (
+            db.session.query(Employer.id, Employer.user_id)
+            .join(Position, Position.employer_id == Employer.id)
+            .group_by(Employer.id).order_by(func.count(Position.id).desc()).first()
+        )
+        self.position_id = (
+            db.session.query(Position.id)
+            .outerjoin(Shortlist, Shortlist.position_id == Position.id)
+            .filter(Position.employer_id == self.employer_id)
+            .group_by(Position.id).order_by(func.count(Shortlist.id).desc()).first()
+        )[0]
+        self.staff_user_id = db.session.query(Staff.user_id).order_by(Staff.id).first()[0]
+        student = (
+            db.session.query(Student.id, Student.user_id, Student.username)
+            .join(Application, Application.student_id == Student.id)
+            .order_by(Application.id).first()
+        )
+        self.student_id, self.student_user_id, self.student_username = student
+        self.application_id = db.session.query(func.max(Application.id)).scalar()
+        self.headers = {
+            role: {"Authorization": f"Bearer {create_access_token(identity=str(user_id))}"}
+            for role, user_id in (
+                ("student", self.student_user_id),
+                ("employer", self.employer_user_id),
+                ("staff", self.staff_user_id),
+            )
+        }
+
+    def name(self):
+        self._names += 1
+        return f"bench{os.getpid() % 1000:03d}{self._names:07d}"
+
+    def applied(self, count):
+        return [i for (i,) in (
+            db.session.query(Application.id).filter(Application.status == ApplicationStatus.APPLIED)
+            .order_by(Application.id.desc()).limit(count)
+        )]
+
+    def pending(self, count, position_id=None):
+        query = (
+            db.session.query(Shortlist.application_id)
+            .join(Position, Position.id == Shortlist.position_id)
+            .filter(Position.employer_id == self.employer_id, Shortlist.status == DecisionStatus.PENDING)
+        )
+        if position_id is not None:
+            query = query.filter(Shortlist.position_id == position_id)
+        return [i for (i,) in query.order_by(Shortlist.id.desc()).limit(count)]
+
+    def unapplied_students(self, count):
+        return [user_id for (user_id,) in (
+            db.session.query(Student.user_id)
+            .outerjoin(Application, Application.student_id == Student.id)
+            .filter(Application.id.is_(None)).order_by(Student.id).limit(count)
+        )]
+
+
+def _repeat(method, path, actor=None, headers=None):
+    """The same request every time."""
+    def build(ctx, count):
+        merged = dict(ctx.headers[actor]) if actor else {}
+        merged.update(headers or {})
+        return [dict(method=method, path=path(ctx) if callable(path) else path, headers=merged)] * count
+    return build
+
+
+def _each(method, actor, request):
+    """One request per target; request(ctx, count) yields (path, kwargs)."""
+    def build(ctx, count):
+        requests = []
+        for path, kwargs in request(ctx, count):
+            headers = dict(ctx.headers[actor]) if actor else {}
+            headers.update(kwargs.pop("headers", {}))
+            requests.append(dict(method=method, path=path, headers=headers, **kwargs))
+        return requests
+    return build
+
+
+def _apply(ctx, count):
+    for user_id in ctx.unapplied_students(count):
+        token = create_access_token(identity=str(user_id))
+        yield "/api/applications/student_apply", {"headers": {"Authorization": f"Bearer {token}"}}
+
+
+def _signup_form(ctx, count):
+    for _ in range(count):
+        yield "/signup", {"data": {"username": ctx.name(), "password": "benchpass", "type": "employer"}}
+
+
+def _signup_api(ctx, count):
+    for _ in range(count):
+        name = ctx.name()
+        yield "/api/signup", {"json": {"username": name, "password": "benchpass", "type": "student",
+                                       "gpa": 3.2, "degree": "Computer Science", "email": f"{name}@example.com"}}
+
+
+CASES = [
+    # applications_api
+    ("GET /api/applications/ping", _repeat("GET", "/api/applications/ping")),
+    ("POST /api/applications/student_apply", _each("POST", None, _apply)),
+    ("GET /api/applications/all_applications", _repeat("GET", "/api/applications/all_applications?limit=50", "staff")),
+    ("GET /api/applications/<id>", _repeat("GET", lambda ctx: f"/api/applications/{ctx.application_id}", "staff")),
+    ("POST /api/applications/<id>/shortlist", _each("POST", "staff", lambda ctx, count: (
+        (f"/api/applications/{i}/shortlist", {"json": {"position_id": ctx.position_id}}) for i in ctx.applied(count)
+    ))),
+    ("POST /api/applications/shortlist:bulk", _each("POST", "staff", lambda ctx, count: (
+        ("/api/applications/shortlist:bulk", {"json": {"items": [
+            {"application_id": i, "position_id": ctx.position_id} for i in chunk
+        ]}})
+        for chunk in _chunks(ctx.applied(count * BULK_SIZE), BULK_SIZE)
+    ))),
+    ("POST /api/applications/<id>/decision", _each("POST", "employer", lambda ctx, count: (
+        (f"/api/applications/{i}/decision", {"json": {"decision": "REJECTED"}}) for i in ctx.pending(count)
+    ))),
+    ("POST /api/signup", _each("POST", None, _signup_api)),
+    ("PATCH /api/students/me", _each("PATCH", "student", lambda ctx, count: (
+        ("/api/students/me", {"json": {"email": f"bench{i}@example.com"}}) for i in range(count)
+    ))),
+    ("POST /api/openings/<id>", _each("POST", "employer", lambda ctx, count: (
+        ("/api/openings/0", {"json": {"title": "Benchmark Engineer", "number": 2}}) for _ in range(count)
+    ))),
+    ("GET /api/openings", _repeat("GET", "/api/openings", "staff")),
+    ("GET /api/stats", _repeat("GET", "/api/stats", "staff")),
+    ("GET /api/admin/slow-queries", _repeat("GET", "/api/admin/slow-queries", "staff")),
+    ("GET /api/search", _repeat("GET", "/api/search?q=software%20eng", "staff")),
+    # application_extras_api
+    ("GET /api/applications/my", _repeat("GET", "/api/applications/my", "student")),
+    ("GET /api/applications/<id>/history", _repeat("GET", lambda ctx: f"/api/applications/{ctx.application_id}/history", "staff")),
+    ("GET /api/applications/status/<status>", _repeat("GET", "/api/applications/status/SHORTLISTED?limit=50", "staff")),
+    # openings_extras_api
+    ("GET /api/openings/my", _repeat("GET", "/api/openings/my", "employer")),
+    ("GET /api/openings/<id>/applications", _repeat("GET", lambda ctx: f"/api/openings/{ctx.position_id}/applications?limit=50", "employer")),
+    ("GET /api/openings/<id>/stats", _repeat("GET", lambda ctx: f"/api/openings/{ctx.position_id}/stats", "employer")),
+    ("GET /api/openings/<id>/candidates", _repeat("GET", lambda ctx: f"/api/openings/{ctx.position_id}/candidates?k=50", "staff")),
+    ("POST /api/openings/<id>/decisions", _each("POST", "employer", lambda ctx, count: (
+        (f"/api/openings/{ctx.position_id}/decisions", {"json": {"decisions": {str(i): "REJECTED" for i in chunk}}})
+        for chunk in _chunks(ctx.pending(count * BULK_SIZE, ctx.position_id), BULK_SIZE)
+    ))),
+    # auth_views
+    ("GET /identify", _repeat("GET", "/identify", "student")),
+    ("POST /login", _each("POST", None, lambda ctx, count: (
+        ("/login", {"data": {"username": ctx.student_username, "password": SEED_PASSWORD}, "headers": {"Referer": "/"}})
+        for _ in range(count)
+    ))),
+    ("POST /signup", _each("POST", None, lambda ctx, count: (
+        (path, dict(kwargs, headers={"Referer": "/"})) for path, kwargs in _signup_form(ctx, count)
+    ))),
+    ("GET /logout", _repeat("GET", "/logout", headers={"Referer": "/"})),
+    ("POST /api/login", _each("POST", None, lambda ctx, count: (
+        ("/api/login", {"json": {"username": ctx.student_username, "password": SEED_PASSWORD}}) for _ in range(count)
+    ))),
+    ("GET /api/identify", _repeat("GET", "/api/identify", "student")),
+    ("GET /api/logout", _repeat("GET", "/api/logout")),
+    # user_views
+    ("GET /users", _repeat("GET", "/users", "staff"), LISTING_REQUESTS),
+    ("GET /api/users", _repeat("GET", "/api/users"), LISTING_REQUESTS),
+    ("GET /static/users", _repeat("GET", "/static/users")),
+]
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def run_case(ctx, client, build, count, statements):
+    """
+    Time count requests (plus one traced for peak memory). Targets are
+    drawn before timing starts, so lookups are not measured.
+    """
+    requests = build(ctx, count + 1)
+    if len(requests) < 2:
+        return None
+    timed, traced = requests[:-1], requests[-1]
+    latencies = []
+    statuses = {}
+    statements[0] = 0
+    for request in timed:
+        started = time.perf_counter()
+        response = client.open(**request)
+        latencies.append(time.perf_counter() - started)
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+        db.session.remove()
+    queries = statements[0] / len(timed)
+
+    tracemalloc.start()
+    client.open(**traced)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.remove()
+
+    return {
+        "requests": len(timed),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "queries_per_request": queries,
+        "peak_kib": peak / 1024,
+        "status": statuses,
+    }
+
+
+def run_scale(applications, requests=DEFAULT_REQUESTS, log=print):
+    """Seed a fresh database with `applications` applications and run every case."""
+    directory = tempfile.mkdtemp(prefix="bench-")
+    path = os.path.join(directory, "bench.db")
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", "SLOW_QUERY_MS": 100})
+    results = {}
+    try:
+        with app.app_context():
+            db.create_all()
+            started = time.perf_counter()
+            seed(
+                students=applications + requests * 2 + 2,
+                employers=max(10, applications // 500),
+                positions=max(40, applications // 50),
+                applications=applications,
+            )
+            log(f"seeded {applications} applications in {time.perf_counter() - started:.1f}s")
+            ctx = BenchContext()
+            client = app.test_client(use_cookies=False)
+            statements = [0]
+
+            def count_statement(conn, cursor, statement, parameters, context, executemany):
+                statements[0] += 1
+
+            event.listen(db.engine, "before_cursor_execute", count_statement)
+            for route, build, *cap in CASES:
+                count = min([requests, *cap])
+                result = run_case(ctx, client, build, count, statements)
+                if result is None:
+                    log(f"{route:<44} skipped: no targets left")
+                    continue
+                results[route] = result
+                log(f"{route:<44}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+                    f"{result['queries_per_request']:>7.1f}{result['peak_kib']:>10.0f}")
+            event.remove(db.engine, "before_cursor_execute", count_statement)
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    return results
+
+
+def run_suite(scales=DEFAULT_SCALES, requests=DEFAULT_REQUESTS, log=print):
+    """Run every scale in scales ("1k,100k,1m") and return the results document."""
+    document = {
+        "meta": {
+            "created": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+            "requests": requests,
+            "skipped": SKIPPED,
+        },
+        "results": {},
+    }
+    for scale in scales.split(","):
+        log(f"\n== {scale} ==\n{'route':<44}{'p50 ms':>9}{'p95 ms':>9}{'sql':>7}{'peak KiB':>10}")
+        document["results"][scale.strip()] = run_scale(parse_scale(scale), requests, log)
+    return document
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    """
+    Routes of current that regressed against baseline. A route regresses
+    when its p95 latency or peak memory grew by more than threshold (and
+    by more than min_delta_ms / MIN_DELTA_KIB, below which timing noise
+    dominates), or when it issues at least one more SQL statement per
+    request. Scales or routes missing from either side are not compared.
+    """
+    regressions = []
+    for scale, routes in current["results"].items():
+        for route, now in routes.items():
+            before = baseline["results"].get(scale, {}).get(route)
+            if before is None:
+                continue
+            checks = (
+                ("p95_ms", before["p95_ms"] * (1 + threshold), min_delta_ms),
+                ("peak_kib", before["peak_kib"] * (1 + threshold), MIN_DELTA_KIB),
+                ("queries_per_request", before["queries_per_request"], 1 - 1e-9),
+            )
+            for metric, limit, floor in checks:
+                if now[metric] > limit and now[metric] - before[metric] >= floor:
+                    regressions.append({
+                        "scale": scale, "route": route, "metric": metric,
+                        "baseline": before[metric], "current": now[metric],
+                    })
+    return regressions
+
+
+def format_regressions(regressions):
+    lines = []
+    for r in regressions:
+        change = f"{(r['current'] / r['baseline'] - 1) * 100:+.0f}%" if r["baseline"] else "new"
+        lines.append(f"{r['scale']:<6}{r['route']:<44}{r['metric']:<20}"
+                     f"{r['baseline']:>10.2f} -> {r['current']:<10.2f}{change}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", default=DEFAULT_SCALES)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--output", default="benchmarks/baseline.json")
+    args = parser.parse_args()
+
+    document = run_suite(args.scales, args.requests)
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
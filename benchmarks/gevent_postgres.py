@@ -0,0 +1,105 @@
+"""
+gevent PostgreSQL concurrency benchmark.
+
+Runs --slow greenlets issuing a --sleep second query each, plus --fast
+greenlets issuing trivial ones, in a gevent-patched process against the
+PostgreSQL server named by the POSTGRES_* variables. The load runs first
+with psycopg2 blocking (no wait callback) and then cooperative
+(install_gevent_wait_callback), reporting wall time, fast-query latency
+and peak pool saturation.
+
+    POSTGRES_URL=localhost:5432 POSTGRES_USER=postgres POSTGRES_DB=postgres \\
+        python -m benchmarks.gevent_postgres --slow 200 --fast 200 --sleep 0.1
+"""
+from gevent import monkey
+
+monkey.patch_all()
+
+import argparse
+import time
+
+import gevent
+from psycopg2 import extensions
+from sqlalchemy import text
+
+from App.main import create_app
+from App.database import db, install_gevent_wait_callback, pool_stats
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def run(app, cooperative, slow, fast, sleep):
+    if cooperative:
+        install_gevent_wait_callback()
+    else:
+        extensions.set_wait_callback(None)
+    with app.app_context():
+        db.engine.dispose()
+        engine = db.engine
+
+    latencies = []
+    peak = {"in_use": 0, "saturation": 0.0}
+    done = gevent.event.Event()
+
+    def slow_query():
+        with app.app_context():
+            db.session.execute(text("SELECT pg_sleep(:s)"), {"s": sleep})
+            db.session.remove()
+
+    def fast_query(arrival):
+        # Measured from when the request arrived, so time spent waiting
+        # for a blocked hub counts
+        with app.app_context():
+            db.session.execute(text("SELECT 1")).scalar()
+            db.session.remove()
+        latencies.append(time.perf_counter() - arrival)
+
+    def sample():
+        while not done.is_set():
+            stats = pool_stats(engine)
+            peak["in_use"] = max(peak["in_use"], stats["in_use"])
+            peak["saturation"] = max(peak["saturation"], stats["saturation"])
+            gevent.sleep(0.005)
+
+    sampler = gevent.spawn(sample)
+    started = time.perf_counter()
+    greenlets = [gevent.spawn(slow_query) for _ in range(slow)]
+    # Trivial requests arriving while the slow ones are in flight
+    interval = sleep / max(1, fast)
+    greenlets += [gevent.spawn_later(i * interval, fast_query, started + i * interval) for i in range(fast)]
+    gevent.joinall(greenlets, raise_error=True)
+    elapsed = time.perf_counter() - started
+    done.set()
+    sampler.join()
+    return {
+        "elapsed_s": elapsed,
+        "fast_p50_ms": percentile(latencies, 0.50) * 1000,
+        "fast_p99_ms": percentile(latencies, 0.99) * 1000,
+        "peak_in_use": peak["in_use"],
+        "peak_saturation": peak["saturation"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--slow", type=int, default=200)
+    parser.add_argument("--fast", type=int, default=200)
+    parser.add_argument("--sleep", type=float, default=0.1)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        capacity = pool_stats(db.engine)["capacity"]
+    print(f"{db.engine.url.render_as_string()}  pool capacity {capacity}")
+    print(f"{'driver':<12} {'wall s':>8} {'fast p50 ms':>12} {'fast p99 ms':>12} {'peak in use':>12} {'saturation':>11}")
+    for label, cooperative in (("blocking", False), ("cooperative", True)):
+        r = run(app, cooperative, args.slow, args.fast, args.sleep)
+        print(f"{label:<12} {r['elapsed_s']:>8.2f} {r['fast_p50_ms']:>12.1f} {r['fast_p99_ms']:>12.1f} "
+              f"{r['peak_in_use']:>12} {r['peak_saturation']:>11.0%}")
+
+
+if __name__ == "__main__":
+    main()
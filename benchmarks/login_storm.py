@@ -0,0 +1,103 @@
+"""
+Login storm benchmark.
+
+Serves the app from one gevent WSGI server (the same event loop a gunicorn
+gevent worker uses), polls GET /api/openings while a burst of concurrent
+POST /api/login requests runs, and reports the polling latency
+percentiles with password hashing inline vs. on the hasher pool.
+
+    python -m benchmarks.login_storm --logins 200 --polls 400
+"""
+from gevent import monkey
+monkey.patch_all()
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import urllib.request
+
+import gevent
+from gevent.pywsgi import WSGIServer
+
+from App.main import create_app
+from App.database import db
+from App.controllers import create_user, open_position, login
+from App.controllers import password
+from App.controllers.password import PasswordHasher
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def request(url, data=None, headers=None):
+    body = json.dumps(data).encode() if data is not None else None
+    req = urllib.request.Request(url, data=body, headers=headers or {})
+    if body is not None:
+        req.add_header("Content-Type", "application/json")
+    with urllib.request.urlopen(req) as response:
+        return response.read()
+
+
+def run(base_url, token, logins, polls, concurrency):
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+
+    def poll():
+        for _ in range(polls // concurrency):
+            started = time.perf_counter()
+            request(f"{base_url}/api/openings", headers=headers)
+            latencies.append(time.perf_counter() - started)
+            gevent.sleep(0.005)
+
+    def storm():
+        for _ in range(logins // concurrency):
+            request(f"{base_url}/api/login", {"username": "stormer", "password": "stormpass"})
+
+    jobs = [gevent.spawn(poll) for _ in range(concurrency)]
+    jobs += [gevent.spawn(storm) for _ in range(concurrency)]
+    gevent.joinall(jobs, raise_error=True)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2, help="hasher pool threads")
+    args = parser.parse_args()
+
+    db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_file}"})
+    db.create_all()
+    employer = create_user("benchemployer", "benchpass", "employer")
+    for i in range(20):
+        open_position(f"Position {i}", employer.user_id, 2)
+    create_user("stormer", "stormpass", "staff")
+    token = login("benchemployer", "benchpass")
+
+    server = WSGIServer(("127.0.0.1", 0), app, log=None)
+    server.start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    print(f"{'hashing':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'hash avg ms':>12} {'wait avg ms':>12}")
+    for label, workers in (("inline", 0), ("pool", args.workers)):
+        password._hasher = PasswordHasher(workers=workers, queue_size=256, timeout=60)
+        latencies = run(base_url, token, args.logins, args.polls, args.concurrency)
+        stats = password._hasher.stats()
+        print(
+            f"{label:<10} {percentile(latencies, 50) * 1000:>8.1f} "
+            f"{percentile(latencies, 95) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} "
+            f"{stats['hash_time_avg'] * 1000:>12.1f} {stats['queue_wait_avg'] * 1000:>12.1f}"
+        )
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+List-response serialization benchmark.
+
+Builds a 10k-row openings response and a 10k-row shortlisted-applications
+response (with positions) two ways and reports CPU time and peak Python
+allocations for each:
+
+- orm:       ORM instances -> dicts by hand -> stdlib JSON provider
+- projected: App.controllers.serializers rows -> orjson provider
+
+    python -m benchmarks.serialization --rows 10000
+"""
+import argparse
+import time
+import tracemalloc
+
+from flask.json.provider import DefaultJSONProvider
+
+from App.main import create_app
+from App.database import db
+from App.models import Application, Position, Shortlist
+from App.models.application_status import ApplicationStatus
+from App.controllers.application import with_shortlist_positions
+from App.controllers.serializers import application_page, position_list
+from App.json_provider import OrjsonProvider
+
+
+def seed(rows):
+    db.session.execute(Position.__table__.insert(), [
+        {"id": i, "title": f"Software Engineer {i}", "number_of_positions": 3,
+         "status": "open", "employer_id": 1 + i % 50}
+        for i in range(1, rows + 1)
+    ])
+    db.session.execute(Application.__table__.insert(), [
+        {"id": i, "student_id": i, "status": ApplicationStatus.SHORTLISTED.name}
+        for i in range(1, rows + 1)
+    ])
+    db.session.execute(Shortlist.__table__.insert(), [
+        {"id": i, "application_id": i, "position_id": i, "staff_id": 1, "status": "PENDING"}
+        for i in range(1, rows + 1)
+    ])
+    db.session.commit()
+
+
+def orm_openings():
+    return [
+        {"position_id": p.id, "title": p.title,
+         "number_of_positions": p.number_of_positions, "employer_id": p.employer_id}
+        for p in Position.query.all()
+    ]
+
+
+def orm_applications(rows):
+    applications = (
+        with_shortlist_positions(Application.query)
+        .filter(Application.status == ApplicationStatus.SHORTLISTED)
+        .order_by(Application.id).limit(rows).all()
+    )
+    items = []
+    for application in applications:
+        position = min(application.shortlists, key=lambda s: s.id).position
+        items.append({
+            "application_id": application.id, "student_id": application.student_id,
+            "status": application.status.name,
+            "position": {"position_id": position.id, "title": position.title},
+        })
+    return items
+
+
+def measure(build, provider, repeat=3):
+    """Best CPU seconds and peak traced bytes for build() + encode."""
+    best_cpu = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.process_time()
+        provider.dumps(build())
+        cpu = time.process_time() - started
+        best_cpu = cpu if best_cpu is None else min(best_cpu, cpu)
+
+    db.session.expunge_all()
+    tracemalloc.start()
+    provider.dumps(build())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best_cpu, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        # Synthetic rows reference parents that are never created
+        "SQLITE_PRAGMAS": {"foreign_keys": None},
+    })
+    db.create_all()
+    seed(args.rows)
+    std, fast = DefaultJSONProvider(app), OrjsonProvider(app)
+
+    cases = [
+        ("openings", "orm", orm_openings, std),
+        ("openings", "projected", position_list, fast),
+        ("applications", "orm", lambda: orm_applications(args.rows), std),
+        ("applications", "projected",
+         lambda: application_page(args.rows, status=ApplicationStatus.SHORTLISTED, with_positions=True)[0], fast),
+    ]
+    print(f"{'response':<14}{'path':<11}{'cpu ms':>9}{'peak MiB':>10}")
+    for response, path, build, provider in cases:
+        cpu, peak = measure(build, provider)
+        print(f"{response:<14}{path:<11}{cpu * 1000:>9.0f}{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
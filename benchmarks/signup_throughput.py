@@ -0,0 +1,68 @@
+"""
+Signup throughput benchmark.
+
+Compares the previous /api/signup sequence (create_user, login, then
+separate degree and GPA commits) with the single-transaction signup()
+fast path, reporting signups per second and SQL statements per signup.
+
+    python -m benchmarks.signup_throughput --signups 50
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+
+from App.main import create_app
+from App.database import db
+from App.controllers import create_user, login, signup
+from App.controllers.student import add_degree_to_student, add_gpa_to_student
+
+
+def legacy_signup(username, password, degree, gpa):
+    created = create_user(username, password, "student")
+    token = login(username, password)
+    add_degree_to_student(created.id, degree)
+    add_gpa_to_student(created.id, gpa)
+    return token
+
+
+def fast_signup(username, password, degree, gpa):
+    return signup(username, password, "student", degree=degree, gpa=gpa)
+
+
+def measure(label, fn, signups):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    started = time.perf_counter()
+    for i in range(signups):
+        assert fn(f"{label}{i}", "benchpass", "Computer Science", 3.5)
+    elapsed = time.perf_counter() - started
+    event.remove(db.engine, "before_cursor_execute", count)
+
+    print(f"{label:<8} {signups / elapsed:>10.1f} {len(statements) / signups:>14.1f}")
+    return signups / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--signups", type=int, default=50)
+    args = parser.parse_args()
+
+    db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+    create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_file}"})
+    db.create_all()
+
+    print(f"{'path':<8} {'signups/s':>10} {'SQL / signup':>14}")
+    legacy = measure("legacy", legacy_signup, args.signups)
+    fast = measure("fast", fast_signup, args.signups)
+    print(f"speedup: {fast / legacy:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
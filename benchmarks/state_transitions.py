@@ -0,0 +1,61 @@
+"""
+Application state machine microbenchmark.
+
+Bulk-loads N applications through the ORM and runs the
+shortlist -> accept/reject transitions on every row, reporting time and
+the number of objects the GC is tracking after the load.
+
+    python -m benchmarks.state_transitions --rows 100000
+"""
+import argparse
+import gc
+import time
+
+from App.main import create_app
+from App.database import db
+from App.models import Application
+from App.models.application_status import ApplicationStatus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        # Synthetic rows reference parents that are never created
+        "SQLITE_PRAGMAS": {"foreign_keys": None},
+    })
+    db.create_all()
+    db.session.execute(
+        Application.__table__.insert(),
+        [{"student_id": i, "status": ApplicationStatus.APPLIED.name} for i in range(1, args.rows + 1)]
+    )
+    db.session.commit()
+    db.session.expunge_all()
+
+    gc.collect()
+    tracked_before = len(gc.get_objects())
+    started = time.perf_counter()
+    applications = Application.query.all()
+    load_time = time.perf_counter() - started
+    tracked = len(gc.get_objects()) - tracked_before
+
+    started = time.perf_counter()
+    for i, application in enumerate(applications):
+        application.shortlist()
+        if i % 2:
+            application.accept()
+        else:
+            application.reject()
+    transition_time = time.perf_counter() - started
+
+    print(f"rows:              {args.rows}")
+    print(f"bulk load:         {load_time * 1000:.0f} ms")
+    print(f"transitions:       {transition_time * 1000:.0f} ms")
+    print(f"GC-tracked / row:  {tracked / args.rows:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,15 @@
 # gunicorn_config.py
+import logging
 import multiprocessing
+import os
+import shutil
 
 # The socket to bind.
 # "0.0.0.0" to bind to all interfaces. 8000 is the port number.
 bind = "0.0.0.0:5000"
 
 # The number of worker processes for handling requests.
-workers = 4
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
 
 # Use the 'gevent' worker type for async performance.
 worker_class = 'gevent'
@@ -16,4 +19,18 @@ loglevel = 'info'
 
 # Where to log to
 accesslog = '-'  # '-' means log to stdout
-errorlog = '-'  # '-' means log to stderr
\ No newline at end of file
+errorlog = '-'  # '-' means log to stderr
+
+# Each worker's connection pool gets an equal share of DB_MAX_CONNECTIONS
+os.environ.setdefault("FLASK_DB_WORKERS", str(workers))
+
+# Let the app's info logs through, e.g. the pool size each worker computed
+logging.getLogger("App").setLevel(logging.INFO)
+
+# Each worker flushes its metrics here; /metrics on any worker sums them all
+metrics_dir = os.environ.setdefault("FLASK_METRICS_DIR", "/tmp/app-metrics")
+
+def on_starting(server):
+    # Drop snapshots left by the workers of a previous run
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
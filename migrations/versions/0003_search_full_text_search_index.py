@@ -0,0 +1,52 @@
+"""full-text search index
+
+SQLite: FTS5 tables for position titles and student username/degree,
+backfilled from the existing rows and kept current by the mapper hooks
+in App/models/search.py.
+PostgreSQL: GIN indexes over the matching to_tsvector expressions.
+
+Revision ID: 0003_search
+Revises: 0002_indexes
+Create Date: 2026-10-17 21:02:13.418702
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_search'
+down_revision = '0002_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS position_search USING fts5(title)")
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS student_search USING fts5(username, degree)")
+        op.execute("INSERT INTO position_search(rowid, title) SELECT id, title FROM position")
+        op.execute(
+            "INSERT INTO student_search(rowid, username, degree) "
+            "SELECT id, username, degree FROM student"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_position_title_fts ON position "
+            "USING gin (to_tsvector('simple', title))"
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_student_profile_fts ON student "
+            "USING gin (to_tsvector('simple', coalesce(username, '') || ' ' || coalesce(degree, '')))"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS student_search")
+        op.execute("DROP TABLE IF EXISTS position_search")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_student_profile_fts")
+        op.execute("DROP INDEX IF EXISTS ix_position_title_fts")
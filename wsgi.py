@@ -1,4 +1,4 @@
-import click, pytest, sys
+import click, json, pytest, sys, time
 from flask.cli import with_appcontext, AppGroup
 
 from App.database import db, get_migrate
@@ -10,6 +10,11 @@ from App.controllers import ( create_user, get_all_users_json, get_all_users, in
 from App.controllers.application import (apply, shortlist, decide)
 from App.controllers.student import add_gpa_to_student, add_degree_to_student, create_student
 from App.controllers.user import get_user
+from App.controllers.search import rebuild_search_index
+from App.controllers.seed import seed, DEFAULT_BATCH_SIZE, SEED_PASSWORD
+from App.controllers.stats import rebuild_stats, get_stats
+from App.controllers.notifications import get_notifier
+from App.slow_queries import get_slow_query_log, top_slow_queries, SORT_KEYS
 from App.models.shortlist import DecisionStatus
 
 
@@ -24,6 +29,25 @@ def init():
     initialize()
     print('database intialized')
 
+# This command appends a synthetic dataset for capacity testing
+@app.cli.command("seed", help="Bulk-inserts a deterministic synthetic dataset")
+@click.option("--students", default=1000, help="Student users to create")
+@click.option("--employers", default=50, help="Employer users to create")
+@click.option("--positions", default=200, help="Positions, spread over the employers")
+@click.option("--applications", default=800, help="Applications (at most one per new student)")
+@click.option("--staff", type=int, default=None, help="Staff users (default: one per 10 employers)")
+@click.option("--seed", "seed_value", default=0, help="Random seed; the same seed gives the same data")
+@click.option("--batch-size", default=DEFAULT_BATCH_SIZE, help="Rows per INSERT batch")
+def seed_command(students, employers, positions, applications, staff, seed_value, batch_size):
+    started = time.perf_counter()
+    try:
+        counts = seed(students, employers, positions, applications, staff, seed_value, batch_size)
+    except ValueError as e:
+        print(str(e))
+        return
+    print(", ".join(f"{count} {name}" for name, count in counts.items()))
+    print(f"Seeded in {time.perf_counter() - started:.1f}s; every seeded user's password is '{SEED_PASSWORD}'")
+
 #command to list all users
 @app.cli.command("list_users", help="Lists all users in the database")
 def list_users():
@@ -351,6 +375,138 @@ def decide_application_command():
 app.cli.add_command(employer_cli) # add the group to the cli
 
 
+##-----------------------------------------Search Commands-----------------------------------------##
+
+search_cli = AppGroup('search', help='Full-text search commands')
+
+@search_cli.command("rebuild", help="Rebuilds the full-text search index from positions and students")
+def rebuild_search_command():
+    rebuild_search_index()
+    print("Search index rebuilt")
+
+app.cli.add_command(search_cli)
+
+
+'''
+Stats Commands
+'''
+
+stats_cli = AppGroup('stats', help='Application status counter commands')
+
+@stats_cli.command("rebuild", help="Recomputes the position_stats counters from applications and shortlists")
+def rebuild_stats_command():
+    rows = rebuild_stats()
+    print(f"Rebuilt {rows} stats rows")
+
+@stats_cli.command("show", help="Shows application counts by status")
+def show_stats_command():
+    for status, count in get_stats().items():
+        print(f"{status:<12}{count}")
+
+app.cli.add_command(stats_cli)
+
+
+'''
+Notification Commands
+'''
+
+notify_cli = AppGroup('notify', help='Decision email outbox commands')
+
+@notify_cli.command("drain", help="Delivers one batch of pending decision emails")
+def drain_notifications_command():
+    counts = get_notifier().drain_once()
+    print(f"Delivered {counts['delivered']}, retrying {counts['retried']}, failed {counts['failed']}")
+
+@notify_cli.command("run", help="Runs the outbox notifier in the foreground until interrupted")
+def run_notifier_command():
+    get_notifier().run_forever()
+
+app.cli.add_command(notify_cli)
+
+
+'''
+Performance Commands
+'''
+
+perf_cli = AppGroup('perf', help='Performance diagnostics commands')
+
+@perf_cli.command("slow-queries", help="Lists the slowest statement fingerprints recorded by every process")
+@click.option("--limit", default=20, help="Number of fingerprints to show")
+@click.option("--sort", type=click.Choice(SORT_KEYS), default="total_ms", help="Ranking column")
+@click.option("--reset", is_flag=True, help="Clear the recorded statements after printing")
+def slow_queries_command(limit, sort, reset):
+    log = get_slow_query_log()
+    if log is None:
+        print("Slow query log is disabled; set SLOW_QUERY_MS (and SLOW_QUERY_DIR to read other processes)")
+        return
+    queries = top_slow_queries(log.collect(), limit, sort)
+    if not queries:
+        print(f"No statements slower than {log.threshold * 1000.0:g} ms recorded")
+    for q in queries:
+        print(f"{q['fingerprint']}  count={q['count']}  total={q['total_ms']:.1f}ms  "
+              f"mean={q['mean_ms']:.1f}ms  max={q['max_ms']:.1f}ms")
+        print(f"    {q['statement'][:200]}")
+        for site, count in q['call_sites'].items():
+            print(f"    {count:>6}  {site}")
+    if reset:
+        log.clear_all()
+        print("Slow query log cleared")
+
+app.cli.add_command(perf_cli)
+
+
+'''
+Benchmark Commands
+'''
+
+bench_cli = AppGroup('bench', help='Endpoint benchmark commands')
+
+# benchmarks.endpoints is imported inside the commands, so loading the app
+# (gunicorn, every other flask command) does not pull in the suite.
+@bench_cli.command("run", help="Seeds each scale and benchmarks every API route, writing a JSON baseline")
+@click.option("--scales", help="Comma-separated application counts, e.g. 1k,100k,1m (default: 1k,100k,1m)")
+@click.option("--requests", type=int, help="Requests per route (default: 50)")
+@click.option("--output", default="benchmarks/baseline.json", help="Where to write the results")
+def bench_run_command(scales, requests, output):
+    from benchmarks.endpoints import run_suite, DEFAULT_SCALES, DEFAULT_REQUESTS
+    document = run_suite(scales or DEFAULT_SCALES, requests or DEFAULT_REQUESTS)
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nWrote {output}")
+
+@bench_cli.command("compare", help="Fails when a route regressed against a baseline")
+@click.argument("baseline", type=click.Path(exists=True))
+@click.option("--current", type=click.Path(exists=True), help="Results to check (default: run the suite at the baseline's scales)")
+@click.option("--threshold", type=float, help="Allowed relative growth of p95 latency and peak memory (default: 0.25)")
+@click.option("--min-delta-ms", type=float, help="Ignore latency growth smaller than this (default: 1.0)")
+@click.option("--output", type=click.Path(), help="Also write the fresh results here")
+def bench_compare_command(baseline, current, threshold, min_delta_ms, output):
+    from benchmarks.endpoints import run_suite, compare, format_regressions, DEFAULT_THRESHOLD, DEFAULT_MIN_DELTA_MS
+    with open(baseline) as f:
+        baseline_document = json.load(f)
+    if current:
+        with open(current) as f:
+            current_document = json.load(f)
+    else:
+        current_document = run_suite(",".join(baseline_document["results"]), baseline_document["meta"]["requests"])
+        if output:
+            with open(output, "w") as f:
+                json.dump(current_document, f, indent=2)
+    regressions = compare(
+        baseline_document, current_document,
+        DEFAULT_THRESHOLD if threshold is None else threshold,
+        DEFAULT_MIN_DELTA_MS if min_delta_ms is None else min_delta_ms,
+    )
+    if not regressions:
+        print("\nNo regressions")
+        return
+    print(f"\n{len(regressions)} regression(s):")
+    print(format_regressions(regressions))
+    sys.exit(1)
+
+app.cli.add_command(bench_cli)
+
+
 '''
 Test Commands
 '''